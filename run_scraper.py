@@ -14,11 +14,15 @@ Goodreads Scraper -     url = input("🔗 Different list URL? (Enter = Best Book
 This script checks required libraries and runs the scraper
 """
 
+import argparse
+import json
 import subprocess
 import sys
-import os
 from pathlib import Path
 
+PROJECT_DIR = Path(__file__).resolve().parent
+SRC_DIR = PROJECT_DIR / 'src'
+
 def check_requirements():
     """Check if required libraries are installed"""
     required_packages = [
@@ -46,8 +50,89 @@ def install_requirements():
         print(f"❌ Library installation error: {e}")
         return False
 
+# Default run configuration (keys match the goodreads_scraper.py arguments)
+DEFAULT_CONFIG = {
+    'url': "https://www.goodreads.com/list/show/1.Best_Books_Ever",
+    'pages': 10,
+    'delay': 1.5,
+    'output': 'goodreads_books.csv',
+    'workers': 1,
+    'session_id': None,
+    'resume': False,
+    'analyze': False,
+    'report': False,
+    'report_formats': ['xlsx'],
+    'archive': False,
+    'data_dir': str(PROJECT_DIR / 'data'),
+}
+
+def load_config(path):
+    """Load a JSON run configuration on top of the defaults"""
+    with open(path, 'r', encoding='utf-8') as f:
+        user_config = json.load(f)
+    
+    unknown = set(user_config) - set(DEFAULT_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown config keys: {', '.join(sorted(unknown))}")
+    
+    return {**DEFAULT_CONFIG, **user_config}
+
+def run(config):
+    """Run scrape -> clean -> analyze in-process
+    
+    Progress (tqdm, logging) is written live to the terminal. The cleaned
+    DataFrame is passed directly to the analysis steps and returned.
+    """
+    config = {**DEFAULT_CONFIG, **config}
+    
+    if str(SRC_DIR) not in sys.path:
+        sys.path.insert(0, str(SRC_DIR))
+    from goodreads_scraper import GoodreadsScraper
+    
+    archive_dir = Path(config['data_dir']) / 'archive' if config['archive'] else None
+    scraper = GoodreadsScraper(delay=config['delay'], data_dir=config['data_dir'], archive_dir=archive_dir)
+    books = scraper.scrape_list(
+        config['url'],
+        max_pages=int(config['pages']),
+        delay=float(config['delay']),
+        session_id=config['session_id'],
+        resume=config['resume'],
+        workers=int(config['workers'])
+    )
+    
+    if not books:
+        print("❌ No book data could be obtained")
+        return None
+    
+    # Cleaning happens in save_to_csv, the returned DataFrame is reused below
+    df = scraper.save_to_csv(books, config['output'])
+    
+    data_file = Path(config['data_dir']) / config['output']
+    print(f"\n📁 Data file created: {data_file}")
+    print(f"📏 File size: {data_file.stat().st_size / 1024:.1f} KB")
+    
+    if config['analyze'] or config['report']:
+        import analyze_data
+        
+        # Aggregates shared by the printed analyses and the report
+        aggregates = analyze_data.compute_aggregates(df)
+        
+        if config['analyze']:
+            analyze_data.basic_statistics(df)
+            analyze_data.top_books(df)
+            analyze_data.top_authors(df, author_stats=aggregates['author_stats'])
+            analyze_data.rating_distribution_analysis(df)
+            analyze_data.engagement_analysis(df)
+            analyze_data.create_visualizations(df, data_dir=config['data_dir'], show=False)
+        
+        if config['report']:
+            analyze_data.export_summary_report(df, data_dir=config['data_dir'], aggregates=aggregates,
+                                               formats=config['report_formats'])
+    
+    return df
+
 def run_scraper():
-    """Run the scraper script with user-defined parameters"""
+    """Run the scraper with user-defined parameters"""
     print("\n📚 Starting Goodreads Scraper")
     
     # Kullanıcıdan parametreler al
@@ -57,7 +142,7 @@ def run_scraper():
     
     url = input("🔗 Different List URL? (Enter = Best Books Ever): ").strip()
     if not url:
-        url = "https://www.goodreads.com/list/show/1.Best_Books_Ever"
+        url = DEFAULT_CONFIG['url']
     
     delay = input("⏱️  Dely between requests(Default:1.5 secs): ").strip()
     if not delay:
@@ -72,41 +157,40 @@ def run_scraper():
     print(f"⏱️ This process may take {int(pages) * 0.5}-{int(pages)} minutes...\n")
     
     try:
-        # Change to src folder
-        original_dir = os.getcwd()
-        os.chdir('src')
-        
-        # Run scraper with arguments
-        command = [
-            sys.executable, "goodreads_scraper.py",
-            "--pages", pages,
-            "--url", url,
-            "--delay", delay,
-            "--output", output
-        ]
-        
-        result = subprocess.run(command, capture_output=True, text=True)
-        
-        # Return to original folder
-        os.chdir(original_dir)
-        
-        if result.returncode == 0:
+        df = run({'pages': int(pages), 'url': url, 'delay': float(delay), 'output': output})
+        if df is not None:
             print("✅ Scraping completed successfully!")
-            print(f"📊 Output: {result.stdout}")
-            
-            # Check if data file was created
-            data_file = Path(f'data/{output}')
-            if data_file.exists():
-                print(f"\n📁 Data file created: {data_file}")
-                print(f"📏 File size: {data_file.stat().st_size / 1024:.1f} KB")
-            
-        else:
-            print("❌ Error occurred during scraping:")
-            print(result.stderr)
             
+    except KeyboardInterrupt:
+        print("\n\n⏹️  Operation stopped by user!")
+        print("💡 Checkpoints saved. You can check with --list-checkpoints.")
     except Exception as e:
         print(f"❌ Script execution error: {e}")
-        os.chdir(original_dir)
+
+def parse_arguments():
+    """Parse command line arguments (no arguments = interactive mode)"""
+    parser = argparse.ArgumentParser(
+        description='Goodreads Scraper runner',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python run_scraper.py
+  python run_scraper.py --config run.json
+  python run_scraper.py --non-interactive --pages 5 --analyze --report
+        """
+    )
+    
+    parser.add_argument('--config', type=str, help='JSON file with run settings (non-interactive)')
+    parser.add_argument('--non-interactive', action='store_true', help='Run without prompts')
+    parser.add_argument('--url', type=str, help='Goodreads list URL to scrape')
+    parser.add_argument('--pages', type=int, help='Number of pages to scrape')
+    parser.add_argument('--delay', type=float, help='Delay between requests (seconds)')
+    parser.add_argument('--output', type=str, help='Output CSV file name')
+    parser.add_argument('--workers', type=int, help='Number of parser processes')
+    parser.add_argument('--analyze', action='store_true', help='Run the analysis on the scraped data')
+    parser.add_argument('--report', action='store_true', help='Export the Excel summary report')
+    
+    return parser.parse_args()
 
 def show_project_info():
     """Display project information"""
@@ -125,6 +209,19 @@ def show_project_info():
 
 def main():
     """Main function"""
+    args = parse_arguments()
+    
+    if args.config or args.non_interactive:
+        config = load_config(args.config) if args.config else dict(DEFAULT_CONFIG)
+        for key in ('url', 'pages', 'delay', 'output', 'workers'):
+            if getattr(args, key) is not None:
+                config[key] = getattr(args, key)
+        config['analyze'] = config['analyze'] or args.analyze
+        config['report'] = config['report'] or args.report
+        
+        df = run(config)
+        sys.exit(0 if df is not None else 1)
+    
     show_project_info()
     
     # Check required libraries
@@ -156,6 +253,7 @@ def main():
         # Analysis suggestion
         print("\n💡 TIP: To analyze the collected data:")
         print("   cd src && python analyze_data.py")
+        print("   or: python run_scraper.py --non-interactive --analyze --report")
         
     else:
         print("👋 Have a great day! Run again when you're ready.")
@@ -7,11 +7,20 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+import math
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from openpyxl import Workbook
 
-def load_data(filename=None):
+try:
+    import pyarrow  # noqa: F401 - needed by DataFrame.to_parquet
+except ImportError:  # Optional dependency - Parquet reports are skipped without it
+    pyarrow = None
+
+def load_data(filename=None, data_dir='../data'):
     """Load CSV file"""
-    data_dir = Path('../data')
+    data_dir = Path(data_dir)
     
     # Try different possible filenames
     possible_files = [
@@ -65,16 +74,43 @@ def top_books(df, n=10):
     print(top_by_ratings.to_string(index=False))
     print()
     
-def top_authors(df, n=10):
+def compute_author_stats(df):
+    """Per-author totals, sorted by total rating count"""
+    author_stats = df.groupby('author', sort=False).agg(
+        Total_Rating_Count=('ratings_count', 'sum'),
+        Book_Count=('title', 'count'),
+        Average_Rating=('average_rating', 'mean')
+    ).round(2)
+    return author_stats.sort_values('Total_Rating_Count', ascending=False)
+
+def compute_aggregates(df, top_n=50):
+    """Compute the report tables once so printing and exports can share them"""
+    aggregates = {
+        'summary': pd.DataFrame({
+            'Metric': ['Total Books', 'Unique Authors', 'Average Rating', 'Median Rating'],
+            'Value': [len(df), df['author'].nunique(),
+                      round(df['average_rating'].mean(), 2),
+                      round(df['average_rating'].median(), 2)]
+        }),
+        'top_books': df.nlargest(top_n, 'ratings_count'),
+        'author_stats': compute_author_stats(df),
+        'lists': {},
+    }
+    
+    # Per-list tables when rows carry the lists they were scraped from (distributed crawls)
+    if 'lists' in df.columns:
+        memberships = df.assign(list_url=df['lists'].str.split(' ')).explode('list_url').drop(columns='lists')
+        for list_url, list_df in memberships.groupby('list_url', sort=False):
+            aggregates['lists'][list_url] = list_df.nlargest(top_n, 'ratings_count')
+    
+    return aggregates
+
+def top_authors(df, n=10, author_stats=None):
     """Show most popular authors"""
     print(f"=== TOP {n} AUTHORS (By Total Rating Count) ===")
-    author_stats = df.groupby('author').agg({
-        'ratings_count': 'sum',
-        'title': 'count',
-        'average_rating': 'mean'
-    }).round(2)
-    author_stats.columns = ['Total_Rating_Count', 'Book_Count', 'Average_Rating']
-    top_authors_list = author_stats.nlargest(n, 'Total_Rating_Count')
+    if author_stats is None:
+        author_stats = compute_author_stats(df)
+    top_authors_list = author_stats.head(n)
     print(top_authors_list.to_string())
     print()
 
@@ -99,7 +135,7 @@ def engagement_analysis(df):
     print(high_engagement.to_string(index=False))
     print()
 
-def create_visualizations(df):
+def create_visualizations(df, data_dir='../data', show=True):
     """Data visualization"""
     plt.style.use('seaborn-v0_8')
     fig, axes = plt.subplots(2, 2, figsize=(15, 12))
@@ -134,35 +170,91 @@ def create_visualizations(df):
     axes[1,1].set_ylabel('Number of Books')
     
     plt.tight_layout()
-    plt.savefig('../data/goodreads_analysis.png', dpi=300, bbox_inches='tight')
+    plt.savefig(Path(data_dir) / 'goodreads_analysis.png', dpi=300, bbox_inches='tight')
     print("📊 Charts saved to 'data/goodreads_analysis.png'")
-    plt.show()
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
 
-def export_summary_report(df):
-    """Export summary report in Excel format"""
-    with pd.ExcelWriter('../data/goodreads_summary_report.xlsx', engine='openpyxl') as writer:
-        # General statistics
-        summary_stats = pd.DataFrame({
-            'Metric': ['Total Books', 'Unique Authors', 'Average Rating', 'Median Rating'],
-            'Value': [len(df), df['author'].nunique(), 
-                     round(df['average_rating'].mean(), 2),
-                     round(df['average_rating'].median(), 2)]
-        })
-        summary_stats.to_excel(writer, sheet_name='Summary_Statistics', index=False)
-        
-        # Most popular books
-        df.nlargest(50, 'ratings_count').to_excel(writer, sheet_name='Most_Popular_Books', index=False)
-        
-        # Author statistics
-        author_stats = df.groupby('author').agg({
-            'ratings_count': 'sum',
-            'title': 'count',
-            'average_rating': 'mean'
-        }).round(2)
-        author_stats.columns = ['Total_Rating_Count', 'Book_Count', 'Average_Rating']
-        author_stats.nlargest(30, 'Total_Rating_Count').to_excel(writer, sheet_name='Author_Statistics')
-        
-    print("📋 Detailed report saved to 'data/goodreads_summary_report.xlsx'")
+def report_sheets(aggregates):
+    """Sheet name -> table for the summary report"""
+    sheets = {
+        'Summary_Statistics': aggregates['summary'],
+        'Most_Popular_Books': aggregates['top_books'],
+        'Author_Statistics': aggregates['author_stats'].reset_index(),
+    }
+    for i, (list_url, list_df) in enumerate(aggregates['lists'].items(), 1):
+        # Excel sheet names are limited to 31 characters and may not contain []:*?/\
+        # (the names are also used in csv/parquet file names)
+        list_name = re.sub(r'[\[\]:*?/\\]', '_', list_url.rstrip('/').split('/')[-1])
+        sheets[f"List_{i}_{list_name}"[:31].rstrip("'")] = list_df
+    return sheets
+
+def _excel_value(value):
+    """Convert numpy scalars and NaN to values openpyxl writes cleanly"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+def write_excel_streaming(path, sheets):
+    """Write sheets with openpyxl's write-only mode (rows are not kept in memory)"""
+    workbook = Workbook(write_only=True)
+    for sheet_name, table in sheets.items():
+        worksheet = workbook.create_sheet(sheet_name)
+        worksheet.append(list(table.columns))
+        for row in table.itertuples(index=False, name=None):
+            worksheet.append([_excel_value(value) for value in row])
+    workbook.save(path)
+
+def write_csv_report(base_path, sheets):
+    for sheet_name, table in sheets.items():
+        table.to_csv(f"{base_path}_{sheet_name}.csv", index=False, encoding='utf-8')
+
+def write_parquet_report(base_path, sheets):
+    for sheet_name, table in sheets.items():
+        table.to_parquet(f"{base_path}_{sheet_name}.parquet", index=False)
+
+def write_html_report(base_path, sheets):
+    with open(f"{base_path}.html", 'w', encoding='utf-8') as f:
+        f.write("<html><head><meta charset='utf-8'><title>Goodreads Summary Report</title></head><body>\n")
+        for sheet_name, table in sheets.items():
+            f.write(f"<h2>{sheet_name.replace('_', ' ')}</h2>\n")
+            f.write(table.to_html(index=False, na_rep=''))
+            f.write("\n")
+        f.write("</body></html>\n")
+
+REPORT_WRITERS = {
+    'xlsx': lambda base_path, sheets: write_excel_streaming(f"{base_path}.xlsx", sheets),
+    'csv': write_csv_report,
+    'parquet': write_parquet_report,
+    'html': write_html_report,
+}
+
+def export_summary_report(df, data_dir='../data', aggregates=None, formats=('xlsx',), parallel=True):
+    """Export summary report (xlsx by default, optionally csv/parquet/html)"""
+    if aggregates is None:
+        aggregates = compute_aggregates(df)
+    sheets = report_sheets(aggregates)
+    base_path = Path(data_dir) / 'goodreads_summary_report'
+    
+    formats = list(formats)
+    if 'parquet' in formats and pyarrow is None:
+        print("⚠️ Parquet report skipped: install 'pyarrow' to enable it")
+        formats.remove('parquet')
+    
+    if parallel and len(formats) > 1:
+        with ThreadPoolExecutor(max_workers=len(formats)) as executor:
+            futures = [executor.submit(REPORT_WRITERS[fmt], base_path, sheets) for fmt in formats]
+            for future in futures:
+                future.result()
+    else:
+        for fmt in formats:
+            REPORT_WRITERS[fmt](base_path, sheets)
+    
+    print(f"📋 Detailed report saved to '{base_path}' ({', '.join(formats)})")
 
 def main():
     """Main analysis function"""
@@ -173,10 +265,13 @@ def main():
     
     print("📚 GOODREADS DATASET ANALYSIS\n")
     
+    # Aggregates shared by the printed analyses and the report
+    aggregates = compute_aggregates(df)
+    
     # Run analyses
     basic_statistics(df)
     top_books(df)
-    top_authors(df)
+    top_authors(df, author_stats=aggregates['author_stats'])
     rating_distribution_analysis(df)
     engagement_analysis(df)
     
@@ -184,7 +279,7 @@ def main():
     create_visualizations(df)
     
     # Export report
-    export_summary_report(df)
+    export_summary_report(df, aggregates=aggregates)
     
     print("\n✅ Analysis completed!")
 
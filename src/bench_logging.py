@@ -0,0 +1,120 @@
+"""
+Logging cost benchmark
+Measures the per-row logging overhead of scrape_book_info for 10k rows,
+comparing the old setup (synchronous FileHandler, eager f-strings) with
+the queue-based setup and lazy %-formatting. Both the time spent in the
+logging calls and the end-to-end time until every record is written are
+reported.
+
+Usage: python bench_logging.py [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import scraper_logging
+
+# Values shaped like one parsed book row
+ROW = {
+    'title': 'The Hunger Games (The Hunger Games, #1) - a reasonably long title',
+    'average_rating': 4.34,
+    'ratings_count': 8123456,
+    'reviews_count': 201345,
+}
+RATING_TEXT = '4.34 avg rating — 8,123,456 ratings'
+
+
+def log_row_eager(book_data, rating_full_text):
+    """Per-row logging as it was written before (f-strings)"""
+    logging.debug(f"Rating text found: {rating_full_text}")
+    logging.debug(f"Book: {book_data['title'][:50]}... - Rating: {book_data['average_rating']}, Ratings: {book_data['ratings_count']}, Reviews: {book_data['reviews_count']}")
+
+
+def log_row_lazy(book_data, rating_full_text):
+    """Per-row logging with lazy %-formatting"""
+    logging.debug("Rating text found: %s", rating_full_text)
+    logging.debug("Book: %.50s... - Rating: %s, Ratings: %s, Reviews: %s",
+                  book_data['title'], book_data['average_rating'],
+                  book_data['ratings_count'], book_data['reviews_count'])
+
+
+def setup_sync(level, log_file):
+    """Old configuration: handlers called on the scraping thread"""
+    scraper_logging.stop_logging()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    handlers = [logging.FileHandler(log_file), logging.StreamHandler(open(os.devnull, 'w'))]
+    for handler in handlers:
+        handler.setFormatter(logging.Formatter(scraper_logging.LOG_FORMAT))
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def drain_sync():
+    """Records are already written when the logging call returns"""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+
+def setup_queue(level, log_file):
+    """New configuration: records handed to the listener thread"""
+    scraper_logging.setup_logging(level=level, log_file=log_file, force=True)
+    # Keep console output out of the measurement
+    scraper_logging._listener.handlers[0].setStream(open(os.devnull, 'w'))
+
+
+def drain_queue():
+    """Wait until the listener has written every queued record"""
+    scraper_logging.stop_logging()
+
+
+def time_rows(setup, drain, log_row, level, log_file, rows):
+    """Return (producer, end-to-end) seconds for logging `rows` rows
+
+    Producer time is what the scraping thread spends in logging calls;
+    end-to-end time also includes writing the records still queued.
+    """
+    setup(level, log_file)
+    start = time.perf_counter()
+    for _ in range(rows):
+        log_row(ROW, RATING_TEXT)
+    produced = time.perf_counter() - start
+    drain()
+    return produced, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-row logging cost')
+    parser.add_argument('--rows', type=int, default=10000, help='Rows per run (default: 10000)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per case, best is reported (default: 5)')
+    args = parser.parse_args()
+
+    cases = [
+        ('before: sync handlers + f-strings', setup_sync, drain_sync, log_row_eager),
+        ('after:  queue listener + lazy %-args', setup_queue, drain_queue, log_row_lazy),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_file = str(Path(tmp_dir) / 'bench.log')
+
+        print(f"Logging cost per {args.rows} rows (best of {args.repeat}), producer / end-to-end")
+        print("-" * 72)
+        for level in (logging.INFO, logging.DEBUG):
+            print(f"Level {logging.getLevelName(level)}:")
+            for name, setup, drain, log_row in cases:
+                runs = [time_rows(setup, drain, log_row, level, log_file, args.rows) for _ in range(args.repeat)]
+                produced = min(run[0] for run in runs)
+                total = min(run[1] for run in runs)
+                print(f"  {name:<40} {produced * 1000:8.2f} ms / {total * 1000:8.2f} ms")
+            print()
+
+        scraper_logging.stop_logging()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,469 @@
+"""
+Indexed title/author search over the scraped dataset
+Builds an inverted index over normalized title/author tokens plus a prefix
+table for autocomplete, stored as memory-mapped segment files.
+
+Usage:
+  python book_search.py build --csv goodreads_books.csv
+  python book_search.py update --csv new_books.csv
+  python book_search.py search "hunger games"
+  python book_search.py suggest "tolk"
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b'GRSI'
+VERSION = 1
+
+# magic, version, doc count, term count, prefix count, then section offsets:
+# docs, strings, terms, term strings, postings, prefixes, prefix strings
+HEADER = struct.Struct('<4sIIII7Q')
+
+# Number of completions cached per short prefix, and the longest cached prefix
+PREFIX_TOP_K = 10
+PREFIX_DEPTH = 3
+# Prefixes expanding to at most this many terms filter candidates per posting list
+PREFIX_FILTER_TERMS = 32
+NO_DOC = 0xFFFFFFFF
+
+DOC_DTYPE = np.dtype([
+    ('str_off', '<u8'), ('title_len', '<u4'), ('author_len', '<u4'), ('url_len', '<u4'),
+    ('score', '<f4'), ('rating', '<f4'), ('ratings_count', '<u8'), ('key', '<u8'),
+])
+TERM_DTYPE = np.dtype([('str_off', '<u8'), ('str_len', '<u4'), ('post_off', '<u8'), ('post_len', '<u4')])
+PREFIX_DTYPE = np.dtype([('str_off', '<u8'), ('str_len', '<u4'), ('top', '<u4', (PREFIX_TOP_K,))])
+
+MANIFEST_FILE = 'manifest.json'
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def normalize_tokens(text) -> List[str]:
+    """Lowercase, strip accents and split into word tokens"""
+    if not isinstance(text, str) or not text:
+        return []
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _TOKEN_RE.findall(stripped.casefold())
+
+
+def book_key(title, author) -> int:
+    """64-bit identity of a book (same key as the title/author dedup in clean_data)"""
+    raw = f"{title}\x00{author}".encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), 'little')
+
+
+def rank_score(average_rating, ratings_count) -> float:
+    """Static rank: average rating weighted by the log of the rating count"""
+    rating = 0.0 if average_rating is None or pd.isna(average_rating) else float(average_rating)
+    count = 0.0 if ratings_count is None or pd.isna(ratings_count) else float(ratings_count)
+    return rating * math.log10(1.0 + max(count, 0.0))
+
+
+def _text(value) -> str:
+    return '' if value is None or (isinstance(value, float) and math.isnan(value)) else str(value)
+
+
+def write_segment(path: Path, books: Iterable[Dict]) -> int:
+    """Write one immutable index segment, returns its document count
+
+    Doc ids are assigned in descending rank order, so every posting list is
+    sorted by rank as well and the first matches of a query are the best ones.
+    A book repeated within the batch is indexed once (its last row wins, as
+    with tombstones across segments).
+    """
+    latest = {book_key(_text(book.get('title')), _text(book.get('author'))): book for book in books}
+    docs = sorted(
+        ({
+            'title': _text(book.get('title')),
+            'author': _text(book.get('author')),
+            'book_url': _text(book.get('book_url')),
+            'average_rating': book.get('average_rating'),
+            'ratings_count': book.get('ratings_count'),
+            'score': rank_score(book.get('average_rating'), book.get('ratings_count')),
+        } for book in latest.values()),
+        key=lambda doc: doc['score'], reverse=True
+    )
+
+    doc_table = np.zeros(len(docs), dtype=DOC_DTYPE)
+    strings = bytearray()
+    postings: Dict[str, List[int]] = {}
+    prefixes: Dict[str, List[int]] = {}
+
+    for doc_id, doc in enumerate(docs):
+        title, author, url = (doc[field].encode('utf-8') for field in ('title', 'author', 'book_url'))
+        count = doc['ratings_count']
+        rating = doc['average_rating']
+        doc_table[doc_id] = (
+            len(strings), len(title), len(author), len(url), doc['score'],
+            0.0 if rating is None or pd.isna(rating) else rating,
+            0 if count is None or pd.isna(count) else int(count),
+            book_key(doc['title'], doc['author']),
+        )
+        strings += title + author + url
+
+        for term in set(normalize_tokens(doc['title']) + normalize_tokens(doc['author'])):
+            postings.setdefault(term, []).append(doc_id)
+            # Docs arrive in rank order, so the first K per prefix are its top K
+            for length in range(1, min(len(term), PREFIX_DEPTH) + 1):
+                top = prefixes.setdefault(term[:length], [])
+                if len(top) < PREFIX_TOP_K and (not top or top[-1] != doc_id):
+                    top.append(doc_id)
+
+    terms = sorted(postings)
+    term_table = np.zeros(len(terms), dtype=TERM_DTYPE)
+    term_strings = bytearray()
+    posting_lists = []
+    post_off = 0
+    for i, term in enumerate(terms):
+        encoded = term.encode('utf-8')
+        term_table[i] = (len(term_strings), len(encoded), post_off, len(postings[term]))
+        term_strings += encoded
+        posting_lists.append(np.asarray(postings[term], dtype='<u4'))
+        post_off += len(postings[term])
+
+    prefix_keys = sorted(prefixes)
+    prefix_table = np.zeros(len(prefix_keys), dtype=PREFIX_DTYPE)
+    prefix_strings = bytearray()
+    for i, prefix in enumerate(prefix_keys):
+        encoded = prefix.encode('utf-8')
+        top = prefixes[prefix] + [NO_DOC] * (PREFIX_TOP_K - len(prefixes[prefix]))
+        prefix_table[i] = (len(prefix_strings), len(encoded), top)
+        prefix_strings += encoded
+
+    sections = [
+        doc_table.tobytes(), bytes(strings), term_table.tobytes(), bytes(term_strings),
+        np.concatenate(posting_lists).tobytes() if posting_lists else b'',
+        prefix_table.tobytes(), bytes(prefix_strings),
+    ]
+    offsets = []
+    position = HEADER.size
+    for section in sections:
+        offsets.append(position)
+        position += len(section)
+
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(docs), len(terms), len(prefix_keys), *offsets))
+        for section in sections:
+            f.write(section)
+    os.replace(tmp_path, path)
+    return len(docs)
+
+
+class Segment:
+    """Read-only, memory-mapped index segment"""
+
+    def __init__(self, path: Path, deleted_path: Optional[Path] = None):
+        self.path = path
+        self._file = open(path, 'rb')
+        self.mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, n_docs, n_terms, n_prefixes, *offsets = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a search index segment: {path}")
+        (off_docs, self.off_strings, off_terms, self.off_term_strings,
+         off_postings, off_prefixes, self.off_prefix_strings) = offsets
+
+        # Zero-copy views over the mapped file
+        self.docs = np.frombuffer(self.mm, DOC_DTYPE, n_docs, off_docs)
+        self.terms = np.frombuffer(self.mm, TERM_DTYPE, n_terms, off_terms)
+        self.postings = np.frombuffer(self.mm, '<u4', (off_prefixes - off_postings) // 4, off_postings)
+        self.prefixes = np.frombuffer(self.mm, PREFIX_DTYPE, n_prefixes, off_prefixes)
+
+        self.deleted = np.zeros(n_docs, dtype=bool)
+        if deleted_path is not None and deleted_path.exists():
+            self.deleted[np.fromfile(deleted_path, dtype='<u4')] = True
+
+    def _term(self, table, i: int, base: int) -> str:
+        entry = table[i]
+        start = base + int(entry['str_off'])
+        return self.mm[start:start + int(entry['str_len'])].decode('utf-8')
+
+    def _lower_bound(self, table, base: int, value: str) -> int:
+        lo, hi = 0, len(table)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(table, mid, base) < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _posting(self, i: int) -> np.ndarray:
+        entry = self.terms[i]
+        start = int(entry['post_off'])
+        return self.postings[start:start + int(entry['post_len'])]
+
+    def term_postings(self, term: str) -> np.ndarray:
+        """Doc ids containing the exact term (rank order)"""
+        i = self._lower_bound(self.terms, self.off_term_strings, term)
+        if i < len(self.terms) and self._term(self.terms, i, self.off_term_strings) == term:
+            return self._posting(i)
+        return np.empty(0, dtype='<u4')
+
+    def prefix_postings(self, prefix: str, limit: int, candidates: Optional[np.ndarray] = None) -> np.ndarray:
+        """Best doc ids having a term that starts with prefix (rank order)
+
+        With `candidates` (doc ids matched by the other query terms) only those
+        are filtered, instead of building the whole prefix range.
+        """
+        if candidates is None and len(prefix) <= PREFIX_DEPTH and limit <= PREFIX_TOP_K:
+            i = self._lower_bound(self.prefixes, self.off_prefix_strings, prefix)
+            if i < len(self.prefixes) and self._term(self.prefixes, i, self.off_prefix_strings) == prefix:
+                top = self.prefixes[i]['top']
+                cached = top[top != NO_DOC]
+                live = cached[~self.deleted[cached]]
+                # Fall back to the full range only if tombstones ate into the cached top K
+                if len(live) == len(cached):
+                    return cached
+            else:
+                # Every term prefix up to PREFIX_DEPTH is in the table
+                return np.empty(0, dtype='<u4')
+
+        # Terms sharing a prefix are adjacent, and so are their posting lists
+        lo = self._lower_bound(self.terms, self.off_term_strings, prefix)
+        hi = self._lower_bound(self.terms, self.off_term_strings, prefix + '\U0010ffff')
+        if lo == hi:
+            return np.empty(0, dtype='<u4')
+        start = int(self.terms[lo]['post_off'])
+        end = int(self.terms[hi - 1]['post_off']) + int(self.terms[hi - 1]['post_len'])
+        if candidates is None and hi - lo == 1:
+            return self.postings[start:end]
+
+        if candidates is not None and hi - lo <= PREFIX_FILTER_TERMS:
+            # Test the best candidates against each posting list until `limit` live ones match
+            postings = [self._posting(i) for i in range(lo, hi)]
+            found = []
+            live = 0
+            begin, chunk = 0, max(limit, 64)
+            while begin < len(candidates) and live < limit:
+                window = candidates[begin:begin + chunk]
+                hit = np.zeros(len(window), dtype=bool)
+                for posting in postings:
+                    positions = np.minimum(np.searchsorted(posting, window), len(posting) - 1)
+                    hit |= posting[positions] == window
+                found.append(window[hit])
+                live += np.count_nonzero(~self.deleted[window[hit]])
+                begin, chunk = begin + chunk, chunk * 2
+            return np.concatenate(found) if found else np.empty(0, dtype='<u4')
+
+        matched = np.zeros(len(self.docs), dtype=bool)
+        matched[self.postings[start:end]] = True
+        if candidates is not None:
+            return candidates[matched[candidates]]
+        return np.flatnonzero(matched).astype('<u4')
+
+    def match(self, terms: List[str], prefix: Optional[str], limit: int) -> List[int]:
+        """Live doc ids matching all terms (and the prefix), best first"""
+        candidates = None
+        for term in sorted(terms, key=len, reverse=True):
+            posting = self.term_postings(term)
+            candidates = posting if candidates is None else np.intersect1d(candidates, posting, assume_unique=True)
+            if not len(candidates):
+                return []
+
+        if prefix is not None:
+            # Without other terms the prefix list must be complete enough to survive tombstones
+            candidates = self.prefix_postings(prefix, limit, candidates)
+
+        if candidates is None:
+            return []
+        live = candidates[~self.deleted[candidates]]
+        return live[:limit].tolist()
+
+    def document(self, doc_id: int) -> Dict:
+        entry = self.docs[doc_id]
+        start = self.off_strings + int(entry['str_off'])
+        title_end = start + int(entry['title_len'])
+        author_end = title_end + int(entry['author_len'])
+        url_end = author_end + int(entry['url_len'])
+        return {
+            'title': self.mm[start:title_end].decode('utf-8'),
+            'author': self.mm[title_end:author_end].decode('utf-8'),
+            'book_url': self.mm[author_end:url_end].decode('utf-8'),
+            'average_rating': round(float(entry['rating']), 2),
+            'ratings_count': int(entry['ratings_count']),
+            'score': float(entry['score']),
+        }
+
+    def close(self):
+        self.docs = self.terms = self.postings = self.prefixes = None
+        self.mm.close()
+        self._file.close()
+
+
+class BookSearchIndex:
+    """Search index made of immutable segments listed in a manifest
+
+    New rows are written as a new segment; older copies of the same book
+    (title + author) are hidden with a tombstone file, so the newest row wins.
+    """
+
+    def __init__(self, index_dir='../data/search_index'):
+        self.index_dir = Path(index_dir)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.index_dir / MANIFEST_FILE
+        self.segments: List[Segment] = []
+        self.manifest = {'generation': 0, 'segments': []}
+        self.reload()
+
+    def reload(self):
+        """(Re)open the segments listed in the manifest"""
+        self.close()
+        if self.manifest_path.exists():
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        for entry in self.manifest['segments']:
+            deleted = self.index_dir / entry['deleted'] if entry.get('deleted') else None
+            self.segments.append(Segment(self.index_dir / entry['file'], deleted))
+
+    def _write_manifest(self):
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def add(self, books: List[Dict]) -> int:
+        """Add rows as a new segment, replacing older copies of the same books"""
+        if not books:
+            return 0
+        generation = self.manifest['generation'] + 1
+        segment_file = f'segment_{generation:06d}.idx'
+        doc_count = write_segment(self.index_dir / segment_file, books)
+
+        new_keys = np.unique(np.array([book_key(_text(b.get('title')), _text(b.get('author'))) for b in books],
+                                      dtype='<u8'))
+        for entry, segment in zip(self.manifest['segments'], self.segments):
+            replaced = np.flatnonzero(np.isin(segment.docs['key'], new_keys) & ~segment.deleted)
+            if len(replaced):
+                deleted = np.union1d(np.flatnonzero(segment.deleted), replaced).astype('<u4')
+                deleted_file = f"{Path(entry['file']).stem}.{generation:06d}.del"
+                deleted.tofile(self.index_dir / deleted_file)
+                entry['deleted'] = deleted_file
+
+        self.manifest['generation'] = generation
+        self.manifest['segments'].append({'file': segment_file, 'docs': doc_count, 'created': time.time()})
+        self._write_manifest()
+        self.reload()
+        self._remove_unused_files()
+        return doc_count
+
+    def compact(self):
+        """Merge all live documents into a single segment"""
+        books = [segment.document(int(doc_id)) for segment in self.segments
+                 for doc_id in np.flatnonzero(~segment.deleted)]
+        generation = self.manifest['generation'] + 1
+        segment_file = f'segment_{generation:06d}.idx'
+        doc_count = write_segment(self.index_dir / segment_file, books)
+        self.manifest = {'generation': generation,
+                         'segments': [{'file': segment_file, 'docs': doc_count, 'created': time.time()}]}
+        self._write_manifest()
+        self.reload()
+        self._remove_unused_files()
+
+    def _remove_unused_files(self):
+        used = {MANIFEST_FILE}
+        for entry in self.manifest['segments']:
+            used.add(entry['file'])
+            if entry.get('deleted'):
+                used.add(entry['deleted'])
+        for path in self.index_dir.iterdir():
+            if path.suffix in ('.idx', '.del') and path.name not in used:
+                path.unlink()
+
+    def _query(self, terms: List[str], prefix: Optional[str], limit: int) -> List[Dict]:
+        results = []
+        for segment in self.segments:
+            for doc_id in segment.match(terms, prefix, limit):
+                results.append((float(segment.docs[doc_id]['score']), segment, doc_id))
+        best = heapq.nlargest(limit, results, key=lambda result: result[0])
+        return [segment.document(doc_id) for _, segment, doc_id in best]
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """Books whose title/author contain every query token"""
+        terms = normalize_tokens(query)
+        if not terms:
+            return []
+        return self._query(terms, None, limit)
+
+    def suggest(self, query: str, limit: int = 10) -> List[Dict]:
+        """Autocomplete: like search, but the last token may be incomplete"""
+        terms = normalize_tokens(query)
+        if not terms:
+            return []
+        if not query[-1:].isalnum():
+            return self._query(terms, None, limit)
+        return self._query(terms[:-1], terms[-1], limit)
+
+    def close(self):
+        for segment in self.segments:
+            segment.close()
+        self.segments = []
+
+
+def load_books(csv_path) -> List[Dict]:
+    """Read scraper output rows from a CSV file"""
+    df = pd.read_csv(csv_path, usecols=['title', 'author', 'average_rating', 'ratings_count', 'book_url'])
+    return df.to_dict('records')
+
+
+def parse_arguments():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Title/author search over the scraped dataset')
+    parser.add_argument('command', choices=['build', 'update', 'compact', 'search', 'suggest'], help='Command to run')
+    parser.add_argument('query', nargs='?', default='', help='Query text (search/suggest)')
+    parser.add_argument('--index', type=str, default='../data/search_index',
+                        help='Index directory (default: ../data/search_index)')
+    parser.add_argument('--csv', type=str, default='../data/goodreads_books.csv',
+                        help='Scraper output CSV for build/update (default: ../data/goodreads_books.csv)')
+    parser.add_argument('--limit', type=int, default=10, help='Number of results (default: 10)')
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    args = parse_arguments()
+    index = BookSearchIndex(args.index)
+
+    if args.command == 'build':
+        index.manifest = {'generation': index.manifest['generation'], 'segments': []}
+        index.reload()
+        count = index.add(load_books(args.csv))
+        print(f"📚 Index built: {count} books")
+    elif args.command == 'update':
+        count = index.add(load_books(args.csv))
+        print(f"📚 Index updated: {count} books added ({len(index.segments)} segments)")
+    elif args.command == 'compact':
+        index.compact()
+        print("📚 Index compacted into 1 segment")
+    else:
+        start = time.perf_counter()
+        finder = index.search if args.command == 'search' else index.suggest
+        results = finder(args.query, args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+        for i, book in enumerate(results, 1):
+            print(f"{i}. {book['title']} - {book['author']} "
+                  f"(⭐ {book['average_rating']}, {book['ratings_count']:,} ratings)")
+        print(f"\n🔍 {len(results)} results in {elapsed:.2f} ms")
+
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
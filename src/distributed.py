@@ -0,0 +1,528 @@
+"""
+Distributed crawl for the Goodreads scraper
+A coordinator expands lists into page tasks on a shared work queue; workers on
+any number of hosts claim tasks under a lease, share one cluster-wide request
+rate budget and write back row batches that the coordinator merges.
+
+Queue backends:
+  SQLite database on a shared volume:  --queue ../data/crawl_queue.db
+  Redis-compatible server:             --queue redis://host:6379/0
+
+Usage:
+  python distributed.py coordinator --queue ../data/crawl_queue.db --url URL --pages 50 --rate 1.0
+  python distributed.py worker --queue ../data/crawl_queue.db
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from goodreads_scraper import BOOK_FIELDS, GoodreadsScraper
+from scraper_logging import setup_logging
+
+try:
+    import redis
+except ImportError:  # Optional dependency - only needed for redis:// queues
+    redis = None
+
+LEASE_SECONDS = 60
+HEARTBEAT_SECONDS = 15
+MAX_ATTEMPTS = 3
+# Cluster-wide requests/second until a coordinator stores its own
+DEFAULT_RATE = 1.0
+
+
+class SQLiteWorkQueue:
+    """Work queue stored in a SQLite database (e.g. on a shared volume)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id INTEGER PRIMARY KEY,
+                list_url TEXT NOT NULL,
+                page_num INTEGER NOT NULL,
+                url TEXT NOT NULL UNIQUE,
+                state TEXT NOT NULL DEFAULT 'pending',
+                worker_id TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, lease_expires);
+            CREATE TABLE IF NOT EXISTS results (
+                task_id INTEGER PRIMARY KEY,
+                worker_id TEXT,
+                rows TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS rate_limit (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                next_slot REAL NOT NULL,
+                rate REAL NOT NULL
+            );
+        """)
+        self.conn.execute('INSERT OR IGNORE INTO rate_limit (id, next_slot, rate) VALUES (1, 0, ?)', (DEFAULT_RATE,))
+
+    def _transaction(self, func):
+        """Run func(cursor) inside an immediate (write-locked) transaction"""
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                result = func(cursor)
+                cursor.execute('COMMIT')
+                return result
+            except Exception:
+                cursor.execute('ROLLBACK')
+                raise
+
+    def add_tasks(self, tasks: List[Dict]) -> int:
+        """Add page tasks, skipping URLs already queued"""
+        def insert(cursor):
+            before = self.conn.total_changes
+            cursor.executemany(
+                'INSERT OR IGNORE INTO tasks (list_url, page_num, url) VALUES (?, ?, ?)',
+                [(task['list_url'], task['page_num'], task['url']) for task in tasks]
+            )
+            return self.conn.total_changes - before
+        return self._transaction(insert)
+
+    def _requeue_expired(self, cursor, max_attempts: int):
+        cursor.execute(
+            "UPDATE tasks SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "lease_expires = NULL WHERE state = 'leased' AND lease_expires < ?",
+            (max_attempts, time.time())
+        )
+        return cursor.rowcount
+
+    def requeue_expired(self, max_attempts: int = MAX_ATTEMPTS) -> int:
+        """Put tasks with expired leases back to pending (failed after max_attempts)"""
+        return self._transaction(lambda cursor: self._requeue_expired(cursor, max_attempts))
+
+    def claim(self, worker_id: str, lease_seconds: float = LEASE_SECONDS,
+              max_attempts: int = MAX_ATTEMPTS) -> Optional[Dict]:
+        """Lease the next pending task (expired leases are requeued first)"""
+        def claim_next(cursor):
+            self._requeue_expired(cursor, max_attempts)
+            now = time.time()
+            row = cursor.execute(
+                "SELECT task_id, list_url, page_num, url, attempts FROM tasks "
+                "WHERE state = 'pending' ORDER BY page_num, task_id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            cursor.execute(
+                "UPDATE tasks SET state = 'leased', worker_id = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE task_id = ?",
+                (worker_id, now + lease_seconds, row[0])
+            )
+            return {'task_id': row[0], 'list_url': row[1], 'page_num': row[2], 'url': row[3], 'attempts': row[4] + 1}
+        return self._transaction(claim_next)
+
+    def heartbeat(self, task_id: int, worker_id: str, lease_seconds: float = LEASE_SECONDS) -> bool:
+        """Extend a lease; returns False if the task was taken over"""
+        def extend(cursor):
+            cursor.execute(
+                "UPDATE tasks SET lease_expires = ? WHERE task_id = ? AND worker_id = ? AND state = 'leased'",
+                (time.time() + lease_seconds, task_id, worker_id)
+            )
+            return cursor.rowcount == 1
+        return self._transaction(extend)
+
+    def complete(self, task_id: int, worker_id: str, rows: List[list]):
+        """Store the row batch of a task (the first finished copy wins)"""
+        def store(cursor):
+            cursor.execute('INSERT OR IGNORE INTO results (task_id, worker_id, rows) VALUES (?, ?, ?)',
+                           (task_id, worker_id, json.dumps(rows, ensure_ascii=False)))
+            cursor.execute("UPDATE tasks SET state = 'done', lease_expires = NULL WHERE task_id = ?", (task_id,))
+        self._transaction(store)
+
+    def fail(self, task_id: int, worker_id: str, max_attempts: int = MAX_ATTEMPTS):
+        """Release a task for retry, or mark it failed after max_attempts"""
+        def release(cursor):
+            cursor.execute(
+                "UPDATE tasks SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "lease_expires = NULL WHERE task_id = ? AND worker_id = ? AND state = 'leased'",
+                (max_attempts, task_id, worker_id)
+            )
+        self._transaction(release)
+
+    def set_rate(self, rate: float):
+        """Set the cluster-wide request budget (requests/second) all workers share"""
+        self._transaction(lambda cursor: cursor.execute('UPDATE rate_limit SET rate = ? WHERE id = 1', (rate,)))
+
+    def reserve_request_slot(self) -> float:
+        """Reserve the next slot of the cluster-wide rate budget, returns seconds to wait"""
+        def reserve(cursor):
+            now = time.time()
+            next_slot, rate = cursor.execute('SELECT next_slot, rate FROM rate_limit WHERE id = 1').fetchone()
+            slot = max(now, next_slot)
+            cursor.execute('UPDATE rate_limit SET next_slot = ? WHERE id = 1', (slot + 1.0 / rate,))
+            return slot - now
+        return self._transaction(reserve)
+
+    def progress(self) -> Dict[str, int]:
+        """Number of tasks per state"""
+        with self._lock:
+            rows = self.conn.execute('SELECT state, COUNT(*) FROM tasks GROUP BY state').fetchall()
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        counts.update(dict(rows))
+        return counts
+
+    def results(self) -> List[Tuple[str, List[list]]]:
+        """(list URL, row batch) of finished tasks in page order"""
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT tasks.list_url, results.rows FROM results JOIN tasks USING (task_id) '
+                'ORDER BY tasks.list_url, tasks.page_num'
+            ).fetchall()
+        return [(list_url, json.loads(batch)) for list_url, batch in rows]
+
+
+class RedisWorkQueue:
+    """Work queue stored on a Redis-compatible server
+
+    Keys (under `prefix`): tasks (hash id -> task JSON), pending (list),
+    leases (sorted set id -> lease expiry), owners (hash), attempts (hash),
+    done/failed (sets), results (hash id -> rows JSON), rate (string,
+    requests/second), rate_next (string).
+
+    Every move between pending, leases and failed is one WATCH/MULTI
+    transaction, so a task is never lost if a process dies mid-move
+    (no server-side scripting needed).
+    """
+
+    def __init__(self, url: str, prefix: str = 'goodreads', client=None):
+        if client is None:
+            if redis is None:
+                raise RuntimeError("redis:// queues need the 'redis' package (pip install redis)")
+            client = redis.Redis.from_url(url)
+        self.r = client
+        self.prefix = prefix
+
+    def _key(self, name: str) -> str:
+        return f'{self.prefix}:{name}'
+
+    def add_tasks(self, tasks: List[Dict]) -> int:
+        """Add page tasks, skipping URLs already queued
+
+        A task is stored and pushed to pending in the same transaction, so it
+        can never exist in tasks without being in any state.
+        """
+        if not tasks:
+            return 0
+        task_ids = [task['url'] for task in tasks]
+
+        def insert(pipe):
+            new_tasks = {}
+            for task, stored in zip(tasks, pipe.hmget(self._key('tasks'), task_ids)):
+                if stored is None:
+                    new_tasks.setdefault(task['url'], json.dumps(task))
+            pipe.multi()
+            if new_tasks:
+                pipe.hset(self._key('tasks'), mapping=new_tasks)
+                pipe.rpush(self._key('pending'), *new_tasks)
+            return len(new_tasks)
+
+        return self.r.transaction(insert, self._key('tasks'), value_from_callable=True)
+
+    def _release(self, pipe, task_id, max_attempts: int):
+        """Queue the release of a leased task (inside MULTI): retry or fail it"""
+        attempts = int(pipe.hget(self._key('attempts'), task_id) or 0)
+        pipe.multi()
+        pipe.zrem(self._key('leases'), task_id)
+        if attempts >= max_attempts:
+            pipe.sadd(self._key('failed'), task_id)
+        else:
+            pipe.rpush(self._key('pending'), task_id)
+
+    def requeue_expired(self, max_attempts: int = MAX_ATTEMPTS) -> int:
+        """Put tasks with expired leases back to pending (failed after max_attempts)"""
+        requeued = 0
+        for task_id in self.r.zrangebyscore(self._key('leases'), 0, time.time()):
+            def requeue(pipe):
+                # Re-check under WATCH: the lease may have been extended or released meanwhile
+                expires = pipe.zscore(self._key('leases'), task_id)
+                if expires is None or expires >= time.time():
+                    return False
+                self._release(pipe, task_id, max_attempts)
+                return True
+
+            if self.r.transaction(requeue, self._key('leases'), value_from_callable=True):
+                requeued += 1
+        return requeued
+
+    def claim(self, worker_id: str, lease_seconds: float = LEASE_SECONDS,
+              max_attempts: int = MAX_ATTEMPTS) -> Optional[Dict]:
+        self.requeue_expired(max_attempts)
+
+        def take(pipe):
+            # Pop the head of pending and lease it in one transaction (retried if pending changes)
+            task_id = pipe.lindex(self._key('pending'), 0)
+            if task_id is None:
+                return None
+            finished = pipe.sismember(self._key('done'), task_id)
+            task_json = pipe.hget(self._key('tasks'), task_id)
+            attempts = int(pipe.hget(self._key('attempts'), task_id) or 0) + 1
+
+            pipe.multi()
+            pipe.lpop(self._key('pending'))
+            if finished:
+                return {}
+            pipe.zadd(self._key('leases'), {task_id: time.time() + lease_seconds})
+            pipe.hset(self._key('owners'), task_id, worker_id)
+            pipe.hset(self._key('attempts'), task_id, attempts)
+
+            task = json.loads(task_json)
+            task['task_id'] = task_id.decode('utf-8') if isinstance(task_id, bytes) else task_id
+            task['attempts'] = attempts
+            return task
+
+        while True:
+            task = self.r.transaction(take, self._key('pending'), value_from_callable=True)
+            if task != {}:  # {}: a stale copy of a finished task was dropped
+                return task
+
+    def _owns(self, task_id, worker_id: str, client=None) -> bool:
+        owner = (client or self.r).hget(self._key('owners'), task_id)
+        if isinstance(owner, bytes):
+            owner = owner.decode('utf-8')
+        return owner == worker_id
+
+    def heartbeat(self, task_id, worker_id: str, lease_seconds: float = LEASE_SECONDS) -> bool:
+        if not self._owns(task_id, worker_id):
+            return False
+        # xx: only extend a lease that still exists
+        self.r.zadd(self._key('leases'), {task_id: time.time() + lease_seconds}, xx=True)
+        return self.r.zscore(self._key('leases'), task_id) is not None
+
+    def complete(self, task_id, worker_id: str, rows: List[list]):
+        pipe = self.r.pipeline()
+        pipe.hsetnx(self._key('results'), task_id, json.dumps(rows, ensure_ascii=False))
+        pipe.sadd(self._key('done'), task_id)
+        pipe.zrem(self._key('leases'), task_id)
+        pipe.execute()
+
+    def fail(self, task_id, worker_id: str, max_attempts: int = MAX_ATTEMPTS):
+        def release(pipe):
+            if not self._owns(task_id, worker_id, pipe) or pipe.zscore(self._key('leases'), task_id) is None:
+                return
+            self._release(pipe, task_id, max_attempts)
+
+        self.r.transaction(release, self._key('leases'), self._key('owners'))
+
+    def set_rate(self, rate: float):
+        self.r.set(self._key('rate'), rate)
+
+    def reserve_request_slot(self) -> float:
+        key = self._key('rate_next')
+
+        def reserve(pipe):
+            now = time.time()
+            slot = max(now, float(pipe.get(key) or 0))
+            rate = float(pipe.get(self._key('rate')) or DEFAULT_RATE)
+            pipe.multi()
+            pipe.set(key, slot + 1.0 / rate)
+            return slot - now
+
+        return self.r.transaction(reserve, key, value_from_callable=True)
+
+    def progress(self) -> Dict[str, int]:
+        total = self.r.hlen(self._key('tasks'))
+        done = self.r.scard(self._key('done'))
+        failed = self.r.scard(self._key('failed'))
+        leased = self.r.zcard(self._key('leases'))
+        return {'pending': max(total - done - failed - leased, 0), 'leased': leased, 'done': done, 'failed': failed}
+
+    def results(self) -> List[Tuple[str, List[list]]]:
+        tasks = {task_id: json.loads(task) for task_id, task in self.r.hgetall(self._key('tasks')).items()}
+        batches = self.r.hgetall(self._key('results'))
+        ordered = sorted(batches, key=lambda task_id: (tasks[task_id]['list_url'], tasks[task_id]['page_num']))
+        return [(tasks[task_id]['list_url'], json.loads(batches[task_id])) for task_id in ordered]
+
+
+def open_queue(spec: str):
+    """Open a work queue from a path or redis:// URL"""
+    if spec.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisWorkQueue(spec)
+    return SQLiteWorkQueue(spec)
+
+
+class Coordinator:
+    """Expands lists into page tasks and merges the workers' row batches"""
+
+    def __init__(self, work_queue, scraper: Optional[GoodreadsScraper] = None):
+        self.queue = work_queue
+        self.scraper = scraper or GoodreadsScraper()
+
+    def plan(self, list_urls: List[str], max_pages: int, rate: float = DEFAULT_RATE) -> int:
+        """Queue one task per list page (clamped to the list's real page count)
+
+        `rate` is stored in the queue as the request budget all workers share.
+        """
+        self.queue.set_rate(rate)
+        tasks = []
+        for list_url in list_urls:
+            total_pages = self.scraper.plan_crawl(list_url, max_pages)['total_pages']
+            tasks.extend(
+                {'list_url': list_url, 'page_num': page_num, 'url': self.scraper._get_page_url(list_url, page_num)}
+                for page_num in range(1, total_pages + 1)
+            )
+        added = self.queue.add_tasks(tasks)
+        logging.info(f"Queued {added} new page tasks ({len(tasks) - added} already queued)")
+        return added
+
+    def wait(self, poll_seconds: float = 5.0):
+        """Block until no task is pending or leased
+
+        Expired leases are requeued (or failed after MAX_ATTEMPTS) here too, so
+        tasks held by dead workers do not keep the crawl open forever.
+        """
+        while True:
+            requeued = self.queue.requeue_expired()
+            if requeued:
+                logging.warning(f"Requeued {requeued} tasks with expired leases")
+            progress = self.queue.progress()
+            logging.info(f"Progress: {progress}")
+            if progress['pending'] == 0 and progress['leased'] == 0:
+                return progress
+            time.sleep(poll_seconds)
+
+    def merge(self) -> List[Dict]:
+        """Merge row batches in page order (duplicates are removed by clean_data)
+
+        Each book keeps the list it was scraped from in `list_url`; clean_data
+        folds these into a `lists` column, which the summary report uses for
+        its per-list sheets.
+        """
+        books = []
+        for list_url, rows in self.queue.results():
+            books.extend(dict(zip(BOOK_FIELDS, row), list_url=list_url) for row in rows)
+        return books
+
+
+class Worker:
+    """Claims page tasks, fetches and parses them under the shared rate budget"""
+
+    def __init__(self, work_queue, worker_id: Optional[str] = None,
+                 scraper: Optional[GoodreadsScraper] = None):
+        self.queue = work_queue
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.scraper = scraper or GoodreadsScraper()
+
+    def _heartbeat(self, task_id, stop_event: threading.Event):
+        while not stop_event.wait(HEARTBEAT_SECONDS):
+            if not self.queue.heartbeat(task_id, self.worker_id):
+                logging.warning(f"Lease lost for task {task_id}")
+                return
+
+    def process(self, task: Dict) -> List[list]:
+        """Fetch and parse one page into compact rows"""
+        wait_seconds = self.queue.reserve_request_slot()
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+
+        content = self.scraper.fetch_page(task['url'])
+        soup = BeautifulSoup(content, 'html.parser')
+        return [[book[field] for field in BOOK_FIELDS] for book in self.scraper.parse_books(soup)]
+
+    def run(self, idle_exit: bool = True, poll_seconds: float = 5.0) -> int:
+        """Process tasks until the queue is empty, returns the number of tasks done"""
+        processed = 0
+        logging.info(f"Worker {self.worker_id} started")
+
+        while True:
+            task = self.queue.claim(self.worker_id)
+            if task is None:
+                progress = self.queue.progress()
+                if idle_exit and progress['leased'] == 0:
+                    break
+                # Other workers hold leases that may expire and come back
+                time.sleep(poll_seconds)
+                continue
+
+            stop_event = threading.Event()
+            heartbeat = threading.Thread(target=self._heartbeat, args=(task['task_id'], stop_event), daemon=True)
+            heartbeat.start()
+            try:
+                rows = self.process(task)
+                self.queue.complete(task['task_id'], self.worker_id, rows)
+                processed += 1
+                logging.info(f"Task {task['url']}: {len(rows)} books")
+            except Exception as e:
+                logging.error(f"Task {task['url']} failed (attempt {task['attempts']}): {e}")
+                self.queue.fail(task['task_id'], self.worker_id)
+            finally:
+                stop_event.set()
+                heartbeat.join()
+
+        logging.info(f"Worker {self.worker_id} finished ({processed} tasks)")
+        return processed
+
+
+def parse_arguments():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description='Distributed Goodreads crawl (coordinator / worker)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python distributed.py coordinator --queue /shared/crawl.db --pages 50 --rate 1.0
+  python distributed.py worker --queue /shared/crawl.db
+  python distributed.py worker --queue redis://queue-host:6379/0
+        """
+    )
+    parser.add_argument('role', choices=['coordinator', 'worker'], help='Role of this process')
+    parser.add_argument('--queue', type=str, default='../data/crawl_queue.db',
+                        help='SQLite path or redis:// URL of the shared queue (default: ../data/crawl_queue.db)')
+    parser.add_argument('--url', type=str, action='append',
+                        help='List URL to crawl (coordinator, can be repeated; default: Best Books Ever)')
+    parser.add_argument('--pages', type=int, default=10, help='Pages per list (coordinator, default: 10)')
+    parser.add_argument('--output', type=str, default='goodreads_books.csv',
+                        help='Merged output CSV file name (coordinator, default: goodreads_books.csv)')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help='Cluster-wide request budget in requests/second, read by all workers '
+                             '(coordinator, default: 1.0)')
+    parser.add_argument('--no-wait', action='store_true', help='Coordinator only queues tasks and exits')
+    parser.add_argument('--verbose', action='store_true', help='Show detailed debug logs')
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    args = parse_arguments()
+    setup_logging(level=logging.DEBUG if args.verbose else logging.INFO)
+
+    work_queue = open_queue(args.queue)
+
+    if args.role == 'worker':
+        Worker(work_queue).run()
+        return
+
+    coordinator = Coordinator(work_queue)
+    coordinator.plan(args.url or ["https://www.goodreads.com/list/show/1.Best_Books_Ever"], args.pages, args.rate)
+    if args.no_wait:
+        return
+
+    progress = coordinator.wait()
+    if progress['failed']:
+        logging.warning(f"{progress['failed']} page tasks failed after {MAX_ATTEMPTS} attempts")
+
+    books = coordinator.merge()
+    if books:
+        coordinator.scraper.save_to_csv(books, args.output)
+    else:
+        logging.error("No book data could be obtained")
+
+
+if __name__ == "__main__":
+    main()
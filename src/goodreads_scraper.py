@@ -5,55 +5,84 @@ Python script for collecting book data from Goodreads Listopia pages
 
 import requests
 from bs4 import BeautifulSoup
+from lxml import etree
+from urllib3.util.request import ACCEPT_ENCODING
 import pandas as pd
 import time
 import re
-from typing import List, Dict, Optional
+import threading
+from typing import Iterator, List, Dict, Optional
 from tqdm import tqdm
 import logging
 import os
 import argparse
 import json
+import sqlite3
+from contextlib import closing
 from pathlib import Path
 
-# Logging configuration
-logging.basicConfig(
-    level=logging.INFO,  # Reverted to INFO level
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('scraper.log'),
-        logging.StreamHandler()
-    ]
-)
+from scraper_logging import setup_logging
 
-class GoodreadsScraper:
-    """Class for collecting book data from Goodreads Listopia pages"""
+# Checkpoint metadata index (lives next to the checkpoint files)
+CHECKPOINT_INDEX_FILE = 'checkpoints.db'
+
+# Temp files of checkpoint saves older than this are leftovers of interrupted saves
+CHECKPOINT_TMP_MAX_AGE = 60 * 60
+
+# Read size for streamed (incrementally parsed) responses
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Column order of a scraped book row
+BOOK_FIELDS = ['title', 'author', 'average_rating', 'ratings_count', 'reviews_count', 'book_url']
+
+class _LxmlTag:
+    """BeautifulSoup-style view of an lxml element (the subset scrape_book_info uses)"""
+    
+    __slots__ = ('element',)
+    
+    def __init__(self, element):
+        self.element = element
+    
+    def get(self, key: str, default=None):
+        return self.element.get(key, default)
+    
+    def get_text(self, strip: bool = False) -> str:
+        texts = self.element.xpath('.//text()')
+        if strip:
+            return ''.join(text.strip() for text in texts)
+        return ''.join(texts)
+    
+    @staticmethod
+    def _string(element) -> Optional[str]:
+        """Like Tag.string: the text of an element whose only content is one string"""
+        children = list(element)
+        if not children:
+            return element.text
+        if len(children) == 1 and not element.text and not children[0].tail:
+            return _LxmlTag._string(children[0])
+        return None
+    
+    def find_all(self, name: str, class_: Optional[str] = None, string=None, href=None) -> List['_LxmlTag']:
+        matches = []
+        for element in self.element.iterdescendants(name):
+            if class_ is not None and class_ not in (element.get('class') or '').split():
+                continue
+            if href is not None and not (element.get('href') is not None and href.search(element.get('href'))):
+                continue
+            if string is not None:
+                text = self._string(element)
+                if text is None or not string.search(text):
+                    continue
+            matches.append(_LxmlTag(element))
+        return matches
+    
+    def find(self, name: str, **kwargs) -> Optional['_LxmlTag']:
+        matches = self.find_all(name, **kwargs)
+        return matches[0] if matches else None
+
+class BookParser:
+    """Extracts book data from Listopia markup (no session or filesystem side effects)"""
     
-    def __init__(self, delay=1.5):
-        self.delay = delay
-        self.books = []
-        self.session = requests.Session()
-        
-        # Initialize checkpoint directory
-        self.checkpoint_dir = Path('../data/checkpoints')
-        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Respectful User-Agent
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
-        
-        # Logging configuration
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('scraper.log'),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger(__name__)
-        
     def extract_number_from_text(self, text: str) -> Optional[int]:
         """Extracts number from text (e.g.: '1,234 ratings' -> 1234)"""
         if not text:
@@ -71,7 +100,7 @@ class GoodreadsScraper:
         return float(rating_match.group(1)) if rating_match else None
     
     def scrape_book_info(self, book_element) -> Dict:
-        """Extracts information for a single book"""
+        """Extracts information for a single book (BeautifulSoup tag or _LxmlTag)"""
         book_data = {
             'title': None,
             'author': None,
@@ -100,7 +129,7 @@ class GoodreadsScraper:
             
             if rating_text:
                 rating_full_text = rating_text.get_text(strip=True)
-                logging.debug(f"Rating text found: {rating_full_text}")
+                logging.debug("Rating text found: %s", rating_full_text)
                 
                 # Extract average rating
                 book_data['average_rating'] = self.extract_rating_from_text(rating_full_text)
@@ -146,7 +175,7 @@ class GoodreadsScraper:
                 for elem in review_elements:
                     if elem and hasattr(elem, 'get_text'):
                         elem_text = elem.get_text(strip=True)
-                        logging.debug(f"Alternative review element found: {elem_text}")
+                        logging.debug("Alternative review element found: %s", elem_text)
                         reviews_match = re.search(r'([\d,]+)\s*reviews?', elem_text, re.IGNORECASE)
                         if reviews_match:
                             book_data['reviews_count'] = self.extract_number_from_text(reviews_match.group(1))
@@ -157,39 +186,126 @@ class GoodreadsScraper:
                     for grey_elem in grey_texts:
                         if grey_elem and hasattr(grey_elem, 'get_text'):
                             grey_text = grey_elem.get_text(strip=True)
-                            logging.debug(f"GreyText element: {grey_text}")
+                            logging.debug("GreyText element: %s", grey_text)
                             reviews_match = re.search(r'([\d,]+)\s*reviews?', grey_text, re.IGNORECASE)
                             if reviews_match:
                                 book_data['reviews_count'] = self.extract_number_from_text(reviews_match.group(1))
                                 break
             
         except Exception as e:
-            logging.warning(f"Error extracting book information: {e}")
+            logging.warning("Error extracting book information: %s", e)
         
-        # Debug: Log extracted data
+        # Debug: Log extracted data (formatted only when DEBUG is enabled)
         if book_data['title']:
-            logging.debug(f"Book: {book_data['title'][:50]}... - Rating: {book_data['average_rating']}, Ratings: {book_data['ratings_count']}, Reviews: {book_data['reviews_count']}")
+            logging.debug("Book: %.50s... - Rating: %s, Ratings: %s, Reviews: %s",
+                          book_data['title'], book_data['average_rating'],
+                          book_data['ratings_count'], book_data['reviews_count'])
         
         return book_data
     
-    def save_checkpoint(self, books: List[Dict], current_page: int, list_url: str, session_id: str):
+    def parse_books(self, soup: BeautifulSoup) -> List[Dict]:
+        """Extract all books from a parsed list page"""
+        # Find the book list
+        book_elements = soup.find_all('tr', itemtype='http://schema.org/Book')
+        
+        page_books = []
+        for book_element in book_elements:
+            book_info = self.scrape_book_info(book_element)
+            if book_info['title']:  # Add book if title exists
+                page_books.append(book_info)
+        
+        return page_books
+
+class GoodreadsScraper(BookParser):
+    """Class for collecting book data from Goodreads Listopia pages"""
+    
+    def __init__(self, delay=1.5, data_dir='../data', archive_dir=None, stream=True):
+        self.delay = delay
+        self.books = []
+        self.session = requests.Session()
+        self.data_dir = Path(data_dir)
+        
+        # Parse responses while they download (see stream_books)
+        self.stream = stream
+        self.transfer_stats = {'pages': 0, 'wire_bytes': 0, 'html_bytes': 0}
+        self._stats_lock = threading.Lock()
+        
+        # Optional raw-page archive for re-parsing (see page_archive.py)
+        self.archive = None
+        if archive_dir:
+            from page_archive import PageArchive
+            self.archive = PageArchive(archive_dir)
+        
+        # Initialize checkpoint directory
+        self.checkpoint_dir = self.data_dir / 'checkpoints'
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Respectful User-Agent, compressed transfer (br/zstd when brotli/zstandard are installed)
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept-Encoding': ACCEPT_ENCODING
+        })
+        
+        # Logging configuration (no-op if already configured)
+        setup_logging()
+        self.logger = logging.getLogger(__name__)
+        
+    def save_checkpoint(self, books: List[Dict], current_page: int, list_url: str, session_id: str,
+                        completed_pages: Optional[List[int]] = None):
         """Save checkpoint file"""
         checkpoint_data = {
             'books': books,
             'current_page': current_page,
+            'completed_pages': sorted(completed_pages) if completed_pages is not None else list(range(1, current_page + 1)),
             'list_url': list_url,
             'timestamp': time.time(),
             'total_books': len(books)
         }
         
         checkpoint_file = self.checkpoint_dir / f'checkpoint_{session_id}.json'
+        tmp_file = checkpoint_file.with_suffix('.json.tmp')
         
         try:
-            with open(checkpoint_file, 'w', encoding='utf-8') as f:
+            # Write to a temp file and rename, so a crash never leaves a half-written checkpoint
+            with open(tmp_file, 'w', encoding='utf-8') as f:
                 json.dump(checkpoint_data, f, ensure_ascii=False, indent=2)
-            logging.info(f"Checkpoint saved: {checkpoint_file} ({len(books)} books)")
+            os.replace(tmp_file, checkpoint_file)
         except Exception as e:
             logging.error(f"Checkpoint save error: {e}")
+            return
+        logging.info(f"Checkpoint saved: {checkpoint_file} ({len(books)} books)")
+        
+        try:
+            self._index_checkpoint(session_id, checkpoint_file, checkpoint_data)
+        except Exception as e:
+            # The checkpoint itself is safe; list_checkpoints re-indexes it from the file
+            logging.warning(f"Checkpoint index update failed ({checkpoint_file}): {e}")
+    
+    def _checkpoint_index(self) -> sqlite3.Connection:
+        """Metadata index of the checkpoints (one row per session)"""
+        conn = sqlite3.connect(self.checkpoint_dir / CHECKPOINT_INDEX_FILE, timeout=30)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                session_id TEXT PRIMARY KEY,
+                file_name TEXT NOT NULL,
+                list_url TEXT,
+                total_books INTEGER NOT NULL,
+                current_page INTEGER NOT NULL,
+                timestamp REAL NOT NULL,
+                file_size INTEGER NOT NULL
+            )
+        """)
+        return conn
+    
+    def _index_checkpoint(self, session_id: str, checkpoint_file: Path, data: Dict):
+        """Insert or update the metadata row of a checkpoint"""
+        with closing(self._checkpoint_index()) as conn, conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (session_id, checkpoint_file.name, data.get('list_url', 'Unknown'),
+                 data.get('total_books', 0), data.get('current_page', 0),
+                 data.get('timestamp', 0), checkpoint_file.stat().st_size)
+            )
     
     def load_checkpoint(self, session_id: str) -> Optional[Dict]:
         """Load checkpoint file"""
@@ -208,16 +324,53 @@ class GoodreadsScraper:
             return None
     
     def list_checkpoints(self) -> List[Dict]:
-        """List existing checkpoints"""
-        checkpoints = []
+        """List existing checkpoints (from the metadata index, without parsing the files)"""
+        checkpoint_files = {path.name: path for path in self.checkpoint_dir.glob('checkpoint_*.json')}
+        
+        with closing(self._checkpoint_index()) as conn:
+            rows = conn.execute(
+                'SELECT session_id, file_name, list_url, total_books, current_page, timestamp, file_size '
+                'FROM checkpoints'
+            ).fetchall()
         
-        for checkpoint_file in self.checkpoint_dir.glob('checkpoint_*.json'):
+        checkpoints = []
+        indexed = set()
+        stale = []
+        for session_id, file_name, list_url, total_books, current_page, timestamp, file_size in rows:
+            if file_name not in checkpoint_files:
+                stale.append(session_id)
+                continue
+            if checkpoint_files[file_name].stat().st_size != file_size:
+                # File rewritten after a failed index update - parsed and re-indexed below
+                continue
+            indexed.add(file_name)
+            checkpoints.append({
+                'session_id': session_id,
+                'file_path': checkpoint_files[file_name],
+                'total_books': total_books,
+                'current_page': current_page,
+                'timestamp': timestamp,
+                'list_url': list_url
+            })
+        
+        if stale:
+            # Checkpoint files removed by hand
+            with closing(self._checkpoint_index()) as conn, conn:
+                conn.executemany('DELETE FROM checkpoints WHERE session_id = ?', [(sid,) for sid in stale])
+        
+        # Checkpoints written before the index existed (or with an outdated row) are parsed once and indexed
+        for file_name, checkpoint_file in checkpoint_files.items():
+            if file_name in indexed:
+                continue
             try:
                 with open(checkpoint_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                 
+                session_id = checkpoint_file.stem.replace('checkpoint_', '')
+                data.setdefault('total_books', len(data.get('books', [])))
+                self._index_checkpoint(session_id, checkpoint_file, data)
                 checkpoints.append({
-                    'session_id': checkpoint_file.stem.replace('checkpoint_', ''),
+                    'session_id': session_id,
                     'file_path': checkpoint_file,
                     'total_books': data.get('total_books', 0),
                     'current_page': data.get('current_page', 0),
@@ -237,31 +390,132 @@ class GoodreadsScraper:
         if checkpoint_file.exists():
             checkpoint_file.unlink()
             logging.info(f"Checkpoint deleted: {session_id}")
+        
+        try:
+            with closing(self._checkpoint_index()) as conn, conn:
+                conn.execute('DELETE FROM checkpoints WHERE session_id = ?', (session_id,))
+        except Exception as e:
+            # The file is already gone; list_checkpoints drops the stale row
+            logging.warning(f"Checkpoint index update failed ({session_id}): {e}")
+    
+    def prune_checkpoints(self, keep: Optional[int] = None, max_age_days: Optional[float] = None) -> List[str]:
+        """Delete checkpoints beyond the newest `keep` or older than `max_age_days`"""
+        checkpoints = self.list_checkpoints()
+        cutoff = time.time() - max_age_days * 86400 if max_age_days is not None else None
+        
+        pruned = []
+        for i, cp in enumerate(checkpoints):
+            too_many = keep is not None and i >= keep
+            too_old = cutoff is not None and cp['timestamp'] < cutoff
+            if too_many or too_old:
+                self.delete_checkpoint(cp['session_id'])
+                pruned.append(cp['session_id'])
+        
+        # Leftovers of interrupted saves (recent ones may belong to a running session)
+        tmp_cutoff = time.time() - CHECKPOINT_TMP_MAX_AGE
+        for tmp_file in self.checkpoint_dir.glob('checkpoint_*.json.tmp'):
+            try:
+                if tmp_file.stat().st_mtime < tmp_cutoff:
+                    tmp_file.unlink()
+            except FileNotFoundError:  # Renamed by its session meanwhile
+                pass
+        
+        return pruned
 
-    def scrape_page(self, url: str) -> List[Dict]:
-        """Scrape all books on a single page"""
+    def _count_transfer(self, wire_bytes: int, html_bytes: int):
+        with self._stats_lock:
+            self.transfer_stats['pages'] += 1
+            self.transfer_stats['wire_bytes'] += wire_bytes
+            self.transfer_stats['html_bytes'] += html_bytes
+    
+    def log_transfer_stats(self):
+        """Log transferred vs. decoded bytes (bandwidth saved by compression)"""
+        stats = self.transfer_stats
+        if not stats['html_bytes']:
+            return
+        saved = 1 - stats['wire_bytes'] / stats['html_bytes']
+        logging.info(f"Transfer: {stats['pages']} pages, {stats['wire_bytes'] / 1024:.1f} KB over the wire "
+                     f"for {stats['html_bytes'] / 1024:.1f} KB of HTML ({saved:.0%} saved)")
+    
+    def fetch_page(self, url: str) -> bytes:
+        """Fetch a page body (and archive it when archiving is enabled)"""
+        response = self.session.get(url)
+        response.raise_for_status()
+        self._count_transfer(response.raw.tell(), len(response.content))
+        
+        if self.archive is not None:
+            self.archive.append(url, response.content)
+        return response.content
+    
+    def stream_books(self, url: str) -> Iterator[Dict]:
+        """Fetch a page and yield its books as each book row is parsed
+        
+        The (decompressed) body is fed to lxml's incremental HTML parser chunk
+        by chunk; finished rows are extracted and cleared right away, so the
+        whole page is never held as one document.
+        """
+        response = self.session.get(url, stream=True)
+        html_bytes = 0
         try:
-            logging.info(f"Scraping page: {url}")
-            response = self.session.get(url)
             response.raise_for_status()
+            charset = re.search(r'charset=([\w-]+)', response.headers.get('Content-Type', ''))
+            parser = etree.HTMLPullParser(events=('end',), tag='tr',
+                                          encoding=charset.group(1) if charset else 'utf-8')
+            body = [] if self.archive is not None else None
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            for chunk in response.raw.stream(STREAM_CHUNK_SIZE, decode_content=True):
+                html_bytes += len(chunk)
+                if body is not None:
+                    body.append(chunk)
+                parser.feed(chunk)
+                yield from self._books_from_events(parser)
             
-            # Find the book list
-            book_elements = soup.find_all('tr', itemtype='http://schema.org/Book')
+            parser.close()
+            yield from self._books_from_events(parser)
             
-            page_books = []
-            for book_element in book_elements:
-                book_info = self.scrape_book_info(book_element)
+            if body is not None:
+                self.archive.append(url, b''.join(body))
+        finally:
+            self._count_transfer(response.raw.tell(), html_bytes)
+            response.close()
+    
+    def _books_from_events(self, parser) -> Iterator[Dict]:
+        """Extract books from the rows closed since the last feed
+        
+        Fields are read straight from the lxml element, so each row is parsed once.
+        """
+        for _, element in parser.read_events():
+            if element.get('itemtype') == 'http://schema.org/Book':
+                book_info = self.scrape_book_info(_LxmlTag(element))
                 if book_info['title']:  # Add book if title exists
-                    page_books.append(book_info)
+                    yield book_info
+            element.clear()
+            # Drop the finished rows before this one, so the tree stays small
+            parent = element.getparent()
+            while parent is not None and element.getprevious() is not None:
+                del parent[0]
+    
+    def scrape_page(self, url: str, content: Optional[bytes] = None) -> Optional[List[Dict]]:
+        """Scrape all books on a single page (content: already fetched body)
+        
+        Returns None when the page could not be fetched or parsed.
+        """
+        try:
+            logging.info(f"Scraping page: {url}")
+            if content is None and self.stream:
+                page_books = list(self.stream_books(url))
+            else:
+                if content is None:
+                    content = self.fetch_page(url)
+                soup = BeautifulSoup(content, 'html.parser')
+                page_books = self.parse_books(soup)
             
             logging.info(f"Found {len(page_books)} books on this page")
             return page_books
             
         except Exception as e:
             logging.error(f"Error scraping page ({url}): {e}")
-            return []
+            return None
     
     def get_next_page_url(self, soup: BeautifulSoup, current_url: str) -> Optional[str]:
         """Find the URL of the next page"""
@@ -283,73 +537,138 @@ class GoodreadsScraper:
             logging.warning(f"Error getting next page URL: {e}")
             return None
     
+    def get_last_page_number(self, soup: BeautifulSoup) -> Optional[int]:
+        """Read the highest page number from the pagination block"""
+        pagination = soup.find('div', class_='pagination')
+        if not pagination:
+            return None
+        
+        page_numbers = []
+        for link in pagination.find_all('a'):
+            page_match = re.search(r'[?&]page=(\d+)', link.get('href', ''))
+            if page_match:
+                page_numbers.append(int(page_match.group(1)))
+            elif link.get_text(strip=True).isdigit():
+                page_numbers.append(int(link.get_text(strip=True)))
+        
+        # The current page is a plain <em>/<span>, not a link
+        current = pagination.find(['em', 'span'], class_='current')
+        if current and current.get_text(strip=True).isdigit():
+            page_numbers.append(int(current.get_text(strip=True)))
+        
+        return max(page_numbers) if page_numbers else None
+    
+    def plan_crawl(self, list_url: str, max_pages: int, completed_pages=()) -> Dict:
+        """Build the page task list from the first page's pagination block
+        
+        Returns the planned page count, the pages still to scrape and the
+        first page body (so it is not fetched twice).
+        """
+        first_page = self.fetch_page(list_url)
+        soup = BeautifulSoup(first_page, 'html.parser')
+        last_page = self.get_last_page_number(soup)
+        
+        if last_page is None:
+            # No pagination block: a single-page list, unless the page has a next link
+            last_page = max_pages if self.get_next_page_url(soup, list_url) else 1
+            logging.warning(f"Pagination not found, planning {last_page} page(s)")
+        else:
+            logging.info(f"List has {last_page} pages")
+        
+        total_pages = min(last_page, max_pages)
+        completed = set(completed_pages)
+        return {
+            'total_pages': total_pages,
+            'pages': [page for page in range(1, total_pages + 1) if page not in completed],
+            'first_page': first_page,
+        }
+    
     def scrape_list(self, list_url: str, max_pages: int = 10, delay: float = 1.0, 
-                   session_id: Optional[str] = None, resume: bool = False) -> List[Dict]:
-        """Scrape multi-page list (with checkpoint support)"""
+                   session_id: Optional[str] = None, resume: bool = False,
+                   workers: int = 1) -> List[Dict]:
+        """Scrape multi-page list (with checkpoint support)
+        
+        The page list is planned up front (see plan_crawl); pages already in
+        the checkpoint are skipped. Failed pages are not marked completed, so
+        the checkpoint is kept and a resume retries them. With workers > 1,
+        pages are parsed in a process pool (see parse_pool.py)
+        """
         
         # Create Session ID
         if not session_id:
             session_id = f"session_{int(time.time())}"
         
         all_books = []
-        current_url = list_url
-        page_count = 0
+        completed_pages = set()
         
         # Resume check
         if resume:
             checkpoint = self.load_checkpoint(session_id)
             if checkpoint:
                 all_books = checkpoint['books']
-                page_count = checkpoint['current_page']
-                current_url = self._get_page_url(list_url, page_count + 1)
-                logging.info(f"Resume: Sayfa {page_count + 1}'den devam ediliyor ({len(all_books)} kitap mevcut)")
+                completed_pages = set(checkpoint.get('completed_pages') or range(1, checkpoint['current_page'] + 1))
+                logging.info(f"Resume: {len(completed_pages)} sayfa atlanıyor ({len(all_books)} kitap mevcut)")
         
         logging.info(f"Starting list scraping: {list_url}")
         logging.info(f"Maximum pages: {max_pages}")
         logging.info(f"Session ID: {session_id}")
         
+        failed_pages = []
+        
+        def page_done(page_num, page_books, pbar):
+            pbar.update(1)
+            if page_books is None:
+                # Failed fetch/parse: not completed, so a resume scrapes it again
+                failed_pages.append(page_num)
+                return
+            
+            all_books.extend(page_books)
+            completed_pages.add(page_num)
+            pbar.set_postfix({"Toplam Kitap": len(all_books)})
+            
+            # Her 2 sayfada bir checkpoint kaydet
+            if len(completed_pages) % 2 == 0 or len(completed_pages) == plan['total_pages']:
+                self.save_checkpoint(all_books, max(completed_pages), list_url, session_id, completed_pages)
+        
         try:
-            with tqdm(total=max_pages, initial=page_count, desc="Processing pages") as pbar:
-                while current_url and page_count < max_pages:
-                    # Scrape the page
-                    page_books = self.scrape_page(current_url)
-                    all_books.extend(page_books)
-                    
-                    page_count += 1
-                    pbar.update(1)
-                    pbar.set_postfix({"Toplam Kitap": len(all_books)})
-                    
-                    # Her 2 sayfada bir checkpoint kaydet
-                    if page_count % 2 == 0 or page_count == max_pages:
-                        self.save_checkpoint(all_books, page_count, list_url, session_id)
+            plan = self.plan_crawl(list_url, max_pages, completed_pages)
+            first_page = plan.pop('first_page')
+            logging.info(f"Planned {plan['total_pages']} pages, {len(plan['pages'])} to scrape")
+            
+            with tqdm(total=plan['total_pages'], initial=plan['total_pages'] - len(plan['pages']),
+                      desc="Processing pages") as pbar:
+                if workers > 1:
+                    from parse_pool import ParsePipeline
+                    pipeline = ParsePipeline(self, workers=workers)
                     
-                    # Sonraki sayfa URL'sini al
-                    if page_count < max_pages:
-                        try:
-                            response = self.session.get(current_url)
-                            soup = BeautifulSoup(response.content, 'html.parser')
-                            next_url = self.get_next_page_url(soup, current_url)
-                        except Exception as e:
-                            logging.error(f"Error getting next page URL: {e}")
-                            # Hata durumunda checkpoint kaydet
-                            self.save_checkpoint(all_books, page_count, list_url, session_id)
-                            raise e
+                    for page_num, page_books in pipeline.run(list_url, plan['pages'], delay,
+                                                             first_page=first_page):
+                        page_done(page_num, page_books, pbar)
+                else:
+                    for i, page_num in enumerate(plan['pages']):
+                        page_url = self._get_page_url(list_url, page_num)
+                        page_books = self.scrape_page(page_url, first_page if page_num == 1 else None)
+                        page_done(page_num, page_books, pbar)
                         
-                        if next_url:
-                            current_url = next_url
+                        if i < len(plan['pages']) - 1:
                             time.sleep(delay)  # Wait for rate limiting
-                        else:
-                            logging.info("Next page not found, scraping completed")
-                            break
             
-            # Successful completion - delete checkpoint
-            self.delete_checkpoint(session_id)
+            if failed_pages:
+                # Keep the checkpoint so the failed pages can be retried
+                self.save_checkpoint(all_books, max(completed_pages, default=0), list_url, session_id,
+                                     completed_pages)
+                logging.warning(f"{len(failed_pages)} pages failed: {sorted(failed_pages)}")
+                logging.info(f"🔄 To retry them: python goodreads_scraper.py --resume --session-id {session_id}")
+            else:
+                # Successful completion - delete checkpoint
+                self.delete_checkpoint(session_id)
             logging.info(f"Total {len(all_books)} books scraped")
+            self.log_transfer_stats()
             return all_books
             
         except KeyboardInterrupt:
             # Interrupted by user - save checkpoint
-            self.save_checkpoint(all_books, page_count, list_url, session_id)
+            self.save_checkpoint(all_books, max(completed_pages, default=0), list_url, session_id, completed_pages)
             logging.warning(f"\n⏹️  Operation stopped by user!")
             logging.info(f"📊 Total {len(all_books)} books saved")
             logging.info(f"🔄 To resume: python goodreads_scraper.py --resume --session-id {session_id}")
@@ -357,7 +676,7 @@ class GoodreadsScraper:
             
         except Exception as e:
             # Hata durumunda checkpoint kaydet
-            self.save_checkpoint(all_books, page_count, list_url, session_id)
+            self.save_checkpoint(all_books, max(completed_pages, default=0), list_url, session_id, completed_pages)
             logging.error(f"❌ Scraping error! Checkpoint saved.")
             logging.info(f"🔄 To resume: python goodreads_scraper.py --resume --session-id {session_id}")
             raise e
@@ -380,11 +699,10 @@ class GoodreadsScraper:
         df = self.clean_data(df)
         
         # Create data folder
-        data_dir = "../data"
-        os.makedirs(data_dir, exist_ok=True)
+        os.makedirs(self.data_dir, exist_ok=True)
         
         # Save to CSV
-        output_path = os.path.join(data_dir, filename)
+        output_path = os.path.join(self.data_dir, filename)
         df.to_csv(output_path, index=False, encoding='utf-8')
         logging.info(f"Data saved: {output_path}")
         logging.info(f"Total rows: {len(df)}")
@@ -402,20 +720,25 @@ class GoodreadsScraper:
         
         # Remove duplicate books
         before_dedup = len(df)
+        if 'list_url' in df.columns:
+            # Multi-list crawls: keep every list a book was found on (space separated) for the per-list report sheets
+            memberships = df.drop_duplicates(subset=['title', 'author', 'list_url'])
+            df = df.assign(lists=memberships.groupby(['title', 'author'], sort=False, dropna=False)['list_url']
+                           .transform(' '.join)).drop(columns='list_url')
         df = df.drop_duplicates(subset=['title', 'author'])
         logging.info(f"Removed {before_dedup - len(df)} duplicate books")
         
+        # Fix data types (before the arithmetic, so all-None columns become float)
+        numeric_columns = ['average_rating', 'ratings_count', 'reviews_count']
+        for col in numeric_columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        
         # Estimate missing review counts (generally reviews are about 10-15% of ratings)
         df['reviews_count'] = df['reviews_count'].fillna(df['ratings_count'] * 0.12)
         
         # Add new features
         df['rating_to_review_ratio'] = df['ratings_count'] / (df['reviews_count'] + 1)  # +1 to avoid division by zero
         
-        # Fix data types
-        numeric_columns = ['average_rating', 'ratings_count', 'reviews_count']
-        for col in numeric_columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-        
         # Sort (descending by rating count)
         df = df.sort_values('ratings_count', ascending=False)
         
@@ -463,12 +786,37 @@ Examples:
         help='Output CSV file name (default: goodreads_books.csv)'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of parser processes (default: 1, parse in the main process)'
+    )
+    
     parser.add_argument(
         '--verbose',
         action='store_true',
         help='Show detailed debug logs'
     )
     
+    parser.add_argument(
+        '--no-stream',
+        action='store_true',
+        help='Download each page completely before parsing (default: parse while downloading)'
+    )
+    
+    parser.add_argument(
+        '--archive',
+        action='store_true',
+        help='Archive raw pages to ../data/archive for re-parsing (see page_archive.py)'
+    )
+    
+    parser.add_argument(
+        '--log-json',
+        action='store_true',
+        help='Write scraper.log as JSON lines'
+    )
+    
     parser.add_argument(
         '--resume',
         action='store_true',
@@ -487,6 +835,24 @@ Examples:
         help='List existing checkpoints'
     )
     
+    parser.add_argument(
+        '--prune-checkpoints',
+        action='store_true',
+        help='Delete old checkpoints (use with --keep and/or --max-age-days)'
+    )
+    
+    parser.add_argument(
+        '--keep',
+        type=int,
+        help='Number of newest checkpoints to keep when pruning (default: 5)'
+    )
+    
+    parser.add_argument(
+        '--max-age-days',
+        type=float,
+        help='Delete checkpoints older than this many days when pruning'
+    )
+    
     return parser.parse_args()
 
 def main():
@@ -494,10 +860,19 @@ def main():
     args = parse_arguments()
     
     # Logging seviyesini ayarla
-    if args.verbose:
-        logging.getLogger().setLevel(logging.DEBUG)
+    setup_logging(level=logging.DEBUG if args.verbose else logging.INFO, json_lines=args.log_json)
     
-    scraper = GoodreadsScraper()
+    scraper = GoodreadsScraper(archive_dir='../data/archive' if args.archive else None,
+                               stream=not args.no_stream)
+    
+    # Checkpoint temizliği istendi
+    if args.prune_checkpoints:
+        keep = args.keep if args.keep is not None or args.max_age_days is not None else 5
+        pruned = scraper.prune_checkpoints(keep=keep, max_age_days=args.max_age_days)
+        print(f"🗑️  {len(pruned)} checkpoint(s) deleted")
+        for session_id in pruned:
+            print(f"   - {session_id}")
+        return
     
     # Checkpoint listesi istendi
     if args.list_checkpoints:
@@ -545,6 +920,8 @@ def main():
     print(f"📄 Page count: {args.pages} (approximately {args.pages * 100} books)")
     print(f"⏱️  Delay between requests: {args.delay} seconds")
     print(f"📁 Output file: {args.output}")
+    if args.workers > 1:
+        print(f"⚙️  Parser processes: {args.workers}")
     if args.resume:
         print(f"🔄 Resume modu: {args.session_id}")
     print("-" * 60)
@@ -556,7 +933,8 @@ def main():
             max_pages=args.pages, 
             delay=args.delay,
             session_id=args.session_id,
-            resume=args.resume
+            resume=args.resume,
+            workers=args.workers
         )
         
         if books:
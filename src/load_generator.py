@@ -0,0 +1,549 @@
+"""
+Synthetic Listopia load generator for the Goodreads scraper
+Renders deterministic list pages with the real Listopia markup (book rows,
+minirating, pagination block), serves them from a local HTTP server and runs
+soak tests against it: throughput, memory growth and resume correctness at
+10k+ pages without touching goodreads.com.
+
+Usage:
+  python load_generator.py serve --pages 10000 --rows 100 --port 8765
+  python goodreads_scraper.py --url "http://127.0.0.1:8765/list/show/1.Synthetic_Load_Test" --pages 10000 --delay 0
+  python load_generator.py soak --pages 2000 --rows 100 --workers 4 --interrupt-after 500
+"""
+
+import argparse
+import gzip
+import html
+import json
+import logging
+import multiprocessing
+import os
+import random
+import re
+import resource
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from urllib.request import urlopen
+
+import pandas as pd
+
+from goodreads_scraper import BOOK_FIELDS, GoodreadsScraper
+from scraper_logging import setup_logging
+
+LIST_PATH = '/list/show/1.Synthetic_Load_Test'
+STATS_PATH = '/_stats'
+
+# Malformed row variants (see SyntheticListopia._render_row)
+MALFORMED_KINDS = ['no_title', 'no_author', 'no_rating', 'unclosed']
+
+ADJECTIVES = ['Silent', 'Crimson', 'Forgotten', 'Last', 'Hidden', 'Broken', 'Golden', 'Distant',
+              'Little', 'Burning', 'Endless', 'Secret', 'Wild', 'Quiet', 'Beautiful', 'Çalıkuşu']
+NOUNS = ['Garden', 'River', 'Kingdom', 'Letters', 'Winter', 'House', 'Road', 'Sea',
+         'Mountain', 'Orchard', 'Daughter', 'Island', 'Library', 'Storm', 'Promise', 'Ölüm']
+FIRST_NAMES = ['Jane', 'George', 'Orhan', 'Sabahattin', 'Toni', 'Haruki', 'Elif', 'Gabriel',
+               'Virginia', 'Fyodor', 'Chimamanda', 'Yaşar', 'Ursula', 'Jorge Luis', 'Agatha', 'Leo']
+LAST_NAMES = ['Austen', 'Orwell', 'Pamuk', 'Ali', 'Morrison', 'Murakami', 'Şafak', 'García',
+              'Woolf', 'Dostoyevsky', 'Adichie', 'Kemal', 'Le Guin', 'Borges', 'Christie', 'Tolstoy']
+SERIES = ['The Chronicles', 'Kingdom Cycle', 'Harbor Trilogy', 'The Long Night']
+
+
+class SyntheticListopia:
+    """Deterministic synthetic Listopia list
+
+    Every page is rendered independently from (seed, page), so any page can be
+    served in any order and re-rendered identically. A row repeats a book from
+    an earlier position with probability `duplicate_rate` and is malformed
+    with probability `malformed_rate`.
+    """
+
+    def __init__(self, pages: int = 1000, rows: int = 100, duplicate_rate: float = 0.02,
+                 malformed_rate: float = 0.01, seed: int = 0):
+        self.pages = pages
+        self.rows = rows
+        self.duplicate_rate = duplicate_rate
+        self.malformed_rate = malformed_rate
+        self.seed = seed
+
+    def book(self, book_id: int) -> Dict:
+        """Book stored at a catalogue position"""
+        rng = random.Random(f"{self.seed}:book:{book_id}")
+        title = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {book_id}"
+        if rng.random() < 0.2:
+            title += f" ({rng.choice(SERIES)}, #{rng.randint(1, 7)})"
+        if rng.random() < 0.05:
+            title = title.replace(' ', ' & ', 1)
+        author_id = rng.randrange(max(1, self.pages * self.rows // 8))
+        author_rng = random.Random(f"{self.seed}:author:{author_id}")
+        return {
+            'book_id': book_id,
+            'title': title,
+            'author': f"{author_rng.choice(FIRST_NAMES)} {author_rng.choice(LAST_NAMES)} {author_id}",
+            'author_id': author_id,
+            'average_rating': round(rng.uniform(2.5, 4.8), 2),
+            # Heavy tail, like real rating counts
+            'ratings_count': int(rng.paretovariate(1.1) * 200),
+            'score': rng.randint(100, 5_000_000),
+            'votes': rng.randint(1, 50_000),
+        }
+
+    def page_rows(self, page: int) -> List[Tuple[int, Dict, Optional[str]]]:
+        """(rank, book, malformed kind) for every row of a page"""
+        rng = random.Random(f"{self.seed}:page:{page}")
+        rows = []
+        for i in range(self.rows):
+            position = (page - 1) * self.rows + i
+            book_id = position
+            if position and rng.random() < self.duplicate_rate:
+                book_id = rng.randrange(position)
+            kind = rng.choice(MALFORMED_KINDS) if rng.random() < self.malformed_rate else None
+            rows.append((position + 1, self.book(book_id), kind))
+        return rows
+
+    def expected_books(self, page: int) -> List[Dict]:
+        """Books the scraper should extract from a page (rows without a title are skipped)"""
+        books = []
+        for _, book, kind in self.page_rows(page):
+            if kind == 'no_title':
+                continue
+            has_rating = kind != 'no_rating'
+            books.append({
+                'title': book['title'],
+                'author': None if kind == 'no_author' else book['author'],
+                'average_rating': book['average_rating'] if has_rating else None,
+                'ratings_count': book['ratings_count'] if has_rating else None,
+                'reviews_count': None,  # Listopia rows only show ratings
+                'book_url': 'https://www.goodreads.com' + self._book_href(book),
+            })
+        return books
+
+    def _book_href(self, book: Dict) -> str:
+        # Goodreads slugs are lowercase ASCII ("/book/show/2767052-the-hunger-games")
+        slug = re.sub(r'[^a-z0-9]+', '-', book['title'].lower().encode('ascii', 'ignore').decode()).strip('-')
+        return f"/book/show/{book['book_id'] + 1}-{slug}"
+
+    def _render_row(self, rank: int, book: Dict, kind: Optional[str]) -> str:
+        href = html.escape(self._book_href(book))
+        title = html.escape(book['title'])
+        cover = (f'<a title="{title}" href="{href}"><img alt="{title}" class="bookCover" itemprop="image" '
+                 f'src="https://images.gr-assets.com/books/{book["book_id"] + 1}s/{book["book_id"] + 1}.jpg" /></a>')
+
+        title_link = ('' if kind == 'no_title' else
+                      f'<a title="{title}" class="bookTitle" itemprop="url" href="{href}">\n'
+                      f'<span itemprop=\'name\' role=\'heading\' aria-level=\'4\'>{title}</span>\n</a>')
+        author_link = ('' if kind == 'no_author' else
+                       f'<a class="authorName" itemprop="url" href="https://www.goodreads.com/author/show/'
+                       f'{book["author_id"] + 1}"><span itemprop="name">{html.escape(book["author"])}</span></a>')
+        if kind == 'no_rating':
+            rating = 'really liked it'
+        else:
+            rating = f'{book["average_rating"]:.2f} avg rating &mdash; {book["ratings_count"]:,} ratings'
+
+        row = f"""<tr itemscope itemtype="http://schema.org/Book">
+  <td valign="top" class="number">{rank}</td>
+  <td width="5%" valign="top">{cover}</td>
+  <td width="100%" valign="top">
+    {title_link}
+    <br/>
+    <span class='by'>by</span>
+    <span itemprop='author' itemscope='' itemtype='http://schema.org/Person'>
+      <div class='authorName__container'>{author_link}</div>
+    </span>
+    <br/>
+    <div>
+      <span class="greyText smallText uitext">
+        <span class="minirating"><span class="stars staticStars notranslate" title="{book["average_rating"]:.2f} of 5 stars"></span> {rating}</span>
+      </span>
+    </div>
+    <div style="margin-top: 5px">
+      <span class="smallText uitext"><a href="#" onclick="Lightbox.showBoxByID('score_explanation', 300); return false;">score: {book["score"]:,}</a>,
+        and <a id="loading_link_{rank}" href="#">{book["votes"]:,} people voted</a></span>
+    </div>
+"""
+        # Real pages occasionally leave the row open; the next <tr> closes it
+        return row if kind == 'unclosed' else row + "  </td>\n</tr>\n"
+
+    def _render_pagination(self, page: int, path: str) -> str:
+        """will_paginate-style block: 1 2 … p-4 … p+4 … last-1 last"""
+        shown = {1, 2, self.pages - 1, self.pages} | set(range(page - 4, page + 5))
+        shown = sorted(n for n in shown if 1 <= n <= self.pages)
+
+        parts = []
+        if page > 1:
+            parts.append(f'<a class="previous_page" rel="prev" href="{path}?page={page - 1}">« previous</a>')
+        else:
+            parts.append('<span class="previous_page disabled">« previous</span>')
+        previous = 0
+        for n in shown:
+            if n > previous + 1:
+                parts.append('<span class="gap">&hellip;</span>')
+            if n == page:
+                parts.append(f'<em class="current">{n}</em>')
+            else:
+                parts.append(f'<a href="{path}?page={n}">{n}</a>')
+            previous = n
+        if page < self.pages:
+            parts.append(f'<a class="next_page" rel="next" href="{path}?page={page + 1}">next »</a>')
+        else:
+            parts.append('<span class="next_page disabled">next »</span>')
+        return f'<div class="pagination">{" ".join(parts)}</div>'
+
+    def render_page(self, page: int, path: str = LIST_PATH) -> bytes:
+        """Full HTML document for a list page"""
+        rows = ''.join(self._render_row(*row) for row in self.page_rows(page))
+        return f"""<!DOCTYPE html>
+<html class="desktop">
+<head>
+  <meta charset="utf-8" />
+  <title>Synthetic Load Test ({self.pages * self.rows:,} books)</title>
+</head>
+<body>
+<div class="mainContentContainer">
+  <div class="leftContainer">
+    <h1>Synthetic Load Test</h1>
+    <div class="stacked">Page {page} of {self.pages}</div>
+    <table class="tableList js-dataTooltip">
+{rows}    </table>
+    <div style="text-align: right">
+      {self._render_pagination(page, path)}
+    </div>
+  </div>
+</div>
+</body>
+</html>
+""".encode('utf-8')
+
+
+class ListopiaRequestHandler(BaseHTTPRequestHandler):
+    """Serves synthetic list pages (?page=n) and request statistics"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == STATS_PATH:
+            self._send(200, json.dumps(self.server.stats()).encode('utf-8'), 'application/json')
+            return
+
+        try:
+            page = int(parse_qs(url.query).get('page', ['1'])[0])
+        except ValueError:
+            self._send(400, b'Bad page number', 'text/plain')
+            return
+        if not url.path.startswith('/list/show/') or not 1 <= page <= self.server.listopia.pages:
+            self._send(404, b'Not found', 'text/plain')
+            return
+
+        self.server.record_hit(page)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self._send(200, self.server.listopia.render_page(page, url.path), 'text/html; charset=utf-8')
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        if self.server.compress and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body, compresslevel=6)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.debug("%s - " + format, self.address_string(), *args)
+
+
+class ListopiaServer(ThreadingHTTPServer):
+    """Local HTTP server for a SyntheticListopia"""
+
+    daemon_threads = True
+
+    def __init__(self, listopia: SyntheticListopia, host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.0, compress: bool = True):
+        super().__init__((host, port), ListopiaRequestHandler)
+        self.listopia = listopia
+        self.latency = latency
+        self.compress = compress
+        self.hits = Counter()
+        self.first_hit = {}
+        self._hits_lock = threading.Lock()
+
+    def record_hit(self, page: int):
+        with self._hits_lock:
+            self.hits[page] += 1
+            self.first_hit.setdefault(page, time.time())
+
+    def stats(self) -> Dict:
+        with self._hits_lock:
+            return {
+                'requests': sum(self.hits.values()),
+                'refetched': {page: count for page, count in self.hits.items() if count > 1},
+                'first_hit': dict(self.first_hit),
+            }
+
+    @property
+    def list_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{LIST_PATH}"
+
+
+def _serve_in_child(listopia: SyntheticListopia, latency: float, compress: bool, connection):
+    """Server process entry point; reports the bound URL back to the parent"""
+    server = ListopiaServer(listopia, latency=latency, compress=compress)
+    connection.send(server.list_url)
+    connection.close()
+    server.serve_forever()
+
+
+def start_server_process(listopia: SyntheticListopia, latency: float = 0.0,
+                         compress: bool = True) -> Tuple[multiprocessing.Process, str]:
+    """Serve in a separate process, so rendering does not compete with the scraper for the GIL"""
+    parent_end, child_end = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_serve_in_child, args=(listopia, latency, compress, child_end),
+                                      daemon=True)
+    process.start()
+    return process, parent_end.recv()
+
+
+def fetch_stats(list_url: str) -> Dict:
+    """Request statistics of a running ListopiaServer"""
+    url = urlsplit(list_url)
+    with urlopen(f"{url.scheme}://{url.netloc}{STATS_PATH}") as response:
+        return json.load(response)
+
+
+def rss_bytes() -> int:
+    """Current resident set size of this process"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:  # No procfs (macOS): fall back to the peak
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MemorySampler(threading.Thread):
+    """Samples this process's RSS in the background"""
+
+    def __init__(self, interval: float = 0.25):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples: List[Tuple[float, int]] = []
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.samples.append((time.time(), rss_bytes()))
+            self._stop_event.wait(self.interval)
+
+    def stop(self) -> List[Tuple[float, int]]:
+        self._stop_event.set()
+        self.join()
+        self.samples.append((time.time(), rss_bytes()))
+        return self.samples
+
+
+class SoakScraper(GoodreadsScraper):
+    """Scraper that times checkpoints and can simulate an interruption
+
+    After `interrupt_after` completed pages, the next checkpoint raises
+    KeyboardInterrupt, exactly like Ctrl+C in the middle of a crawl.
+    """
+
+    def __init__(self, *args, interrupt_after: Optional[int] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.interrupt_after = interrupt_after
+        self.checkpoint_seconds = 0.0
+        self.checkpoint_count = 0
+
+    def save_checkpoint(self, books, current_page, list_url, session_id, completed_pages=None):
+        start = time.perf_counter()
+        super().save_checkpoint(books, current_page, list_url, session_id, completed_pages)
+        self.checkpoint_seconds += time.perf_counter() - start
+        self.checkpoint_count += 1
+
+        if self.interrupt_after and completed_pages and len(completed_pages) >= self.interrupt_after:
+            self.interrupt_after = None
+            raise KeyboardInterrupt
+
+
+def compare_books(scraped: List[Dict], expected: List[Dict]) -> Dict[str, int]:
+    """Missing and extra rows between two book lists (order-insensitive)"""
+    def as_counter(books):
+        return Counter(tuple(book.get(field) for field in BOOK_FIELDS) for book in books)
+
+    scraped_rows, expected_rows = as_counter(scraped), as_counter(expected)
+    return {
+        'missing': sum((expected_rows - scraped_rows).values()),
+        'extra': sum((scraped_rows - expected_rows).values()),
+    }
+
+
+def soak(listopia: SyntheticListopia, workers: int = 1, interrupt_after: Optional[int] = None,
+         delay: float = 0.0, latency: float = 0.0, stream: bool = True, compress: bool = True,
+         data_dir: Optional[str] = None) -> Dict:
+    """Crawl the whole synthetic list (optionally interrupted and resumed) and measure it"""
+    process, list_url = start_server_process(listopia, latency, compress)
+    temp_dir = None
+    if data_dir is None:
+        temp_dir = tempfile.TemporaryDirectory(prefix='listopia_soak_')
+        data_dir = temp_dir.name
+    session_id = f"soak_{int(time.time())}"
+    logging.info(f"Soak test: {listopia.pages} pages x {listopia.rows} rows from {list_url}")
+
+    sampler = MemorySampler()
+    sampler.start()
+    start = time.time()
+    try:
+        scraper = SoakScraper(delay=delay, data_dir=data_dir, stream=stream, interrupt_after=interrupt_after)
+        books = None
+        interrupted = False
+        checkpointed_pages = set()
+        if interrupt_after:
+            try:
+                books = scraper.scrape_list(list_url, listopia.pages, delay, session_id=session_id, workers=workers)
+            except KeyboardInterrupt:
+                interrupted = True
+                checkpointed_pages = set(scraper.load_checkpoint(session_id)['completed_pages'])
+                logging.info(f"Simulated interruption after {len(checkpointed_pages)} pages, resuming")
+        if books is None:
+            checkpoint_seconds, checkpoint_count = scraper.checkpoint_seconds, scraper.checkpoint_count
+            scraper = SoakScraper(delay=delay, data_dir=data_dir, stream=stream)
+            scraper.checkpoint_seconds, scraper.checkpoint_count = checkpoint_seconds, checkpoint_count
+            books = scraper.scrape_list(list_url, listopia.pages, delay, session_id=session_id,
+                                        resume=interrupted, workers=workers)
+        elapsed = time.time() - start
+        memory = sampler.stop()
+        stats = fetch_stats(list_url)
+        leftover_checkpoints = [c for c in scraper.list_checkpoints() if c['session_id'] == session_id]
+    finally:
+        process.terminate()
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    expected = [book for page in range(1, listopia.pages + 1) for book in listopia.expected_books(page)]
+    cleaned = scraper.clean_data(pd.DataFrame(books, columns=BOOK_FIELDS))
+    expected_unique = len({(book['title'], book['author']) for book in expected})
+
+    # Throughput over the first and last tenth of the crawl (page request times)
+    hit_times = sorted(stats['first_hit'].values())
+    tenth = max(1, len(hit_times) // 10)
+
+    def pages_per_second(times):
+        return (len(times) - 1) / (times[-1] - times[0]) if len(times) > 1 and times[-1] > times[0] else float('nan')
+
+    rss = [value for _, value in memory]
+    refetched = {int(page) for page in stats['refetched']}
+    return {
+        'pages': listopia.pages,
+        'books': len(books),
+        'elapsed': elapsed,
+        'pages_per_second': listopia.pages / elapsed,
+        'books_per_second': len(books) / elapsed,
+        'first_tenth_pages_per_second': pages_per_second(hit_times[:tenth]),
+        'last_tenth_pages_per_second': pages_per_second(hit_times[-tenth:]),
+        'checkpoints': scraper.checkpoint_count,
+        'checkpoint_seconds': scraper.checkpoint_seconds,
+        'rss_start': rss[0],
+        'rss_peak': max(rss),
+        'rss_end': rss[-1],
+        'interrupted': interrupted,
+        'requests': stats['requests'],
+        # Pages in flight at the interruption are fetched again; checkpointed ones must not be
+        # (except page 1, which is fetched again to plan the resumed crawl)
+        'refetched_pages': sorted(refetched & (checkpointed_pages - {1}) if interrupted else refetched),
+        'refetched_in_flight': len(refetched - checkpointed_pages) if interrupted else 0,
+        'leftover_checkpoints': len(leftover_checkpoints),
+        'cleaned_rows': len(cleaned),
+        'expected_cleaned_rows': expected_unique,
+        **compare_books(books, expected),
+    }
+
+
+def print_soak_report(result: Dict) -> bool:
+    """Print the soak test results; returns True when the crawl was correct"""
+    mb = 1024 * 1024
+    print(f"\n=== SOAK TEST ({result['pages']:,} pages) ===")
+    print(f"⏱️  {result['elapsed']:.1f}s, {result['pages_per_second']:.1f} pages/s, "
+          f"{result['books_per_second']:,.0f} books/s")
+    print(f"📈 Throughput first 10%: {result['first_tenth_pages_per_second']:.1f} pages/s, "
+          f"last 10%: {result['last_tenth_pages_per_second']:.1f} pages/s")
+    print(f"💾 Checkpoints: {result['checkpoints']} in {result['checkpoint_seconds']:.1f}s")
+    print(f"🧠 RSS: start {result['rss_start'] / mb:.0f} MB, peak {result['rss_peak'] / mb:.0f} MB, "
+          f"end {result['rss_end'] / mb:.0f} MB "
+          f"({(result['rss_end'] - result['rss_start']) / mb / result['pages'] * 1000:.1f} MB per 1k pages)")
+    print(f"🌐 Requests: {result['requests']:,}" + (
+        f" (interrupted and resumed, {result['refetched_in_flight']} in-flight pages fetched again)"
+        if result['interrupted'] else ""))
+
+    checks = {
+        'scraped rows match the generated pages': result['missing'] == 0 and result['extra'] == 0,
+        'no checkpointed page fetched twice': not result['refetched_pages'],
+        'checkpoint removed after completion': result['leftover_checkpoints'] == 0,
+        'clean_data keeps one row per book': result['cleaned_rows'] == result['expected_cleaned_rows'],
+    }
+    for check, passed in checks.items():
+        print(f"{'✅' if passed else '❌'} {check}")
+    if result['missing'] or result['extra']:
+        print(f"   {result['missing']:,} rows missing, {result['extra']:,} unexpected rows")
+    if result['refetched_pages']:
+        print(f"   Fetched more than once: {result['refetched_pages'][:20]}")
+    if result['cleaned_rows'] != result['expected_cleaned_rows']:
+        print(f"   {result['cleaned_rows']:,} cleaned rows, expected {result['expected_cleaned_rows']:,}")
+    return all(checks.values())
+
+
+def parse_arguments():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Synthetic Listopia server and soak tests')
+    parser.add_argument('command', choices=['serve', 'soak'], help='Command to run')
+    parser.add_argument('--pages', type=int, default=1000, help='Number of list pages (default: 1000)')
+    parser.add_argument('--rows', type=int, default=100, help='Book rows per page (default: 100)')
+    parser.add_argument('--duplicate-rate', type=float, default=0.02,
+                        help='Share of rows repeating an earlier book (default: 0.02)')
+    parser.add_argument('--malformed-rate', type=float, default=0.01,
+                        help='Share of malformed rows (default: 0.01)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Server delay per page in seconds (default: 0)')
+    parser.add_argument('--no-gzip', action='store_true', help='Serve uncompressed responses')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='serve: bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='serve: port (default: 8765)')
+    parser.add_argument('--workers', type=int, default=1, help='soak: parser processes (default: 1)')
+    parser.add_argument('--delay', type=float, default=0.0, help='soak: scraper delay between pages (default: 0)')
+    parser.add_argument('--interrupt-after', type=int,
+                        help='soak: interrupt after this many pages and resume from the checkpoint')
+    parser.add_argument('--no-stream', action='store_true', help='soak: parse whole pages instead of streaming')
+    parser.add_argument('--data-dir', type=str, help='soak: checkpoint directory (default: temporary)')
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    args = parse_arguments()
+    listopia = SyntheticListopia(args.pages, args.rows, args.duplicate_rate, args.malformed_rate, args.seed)
+
+    if args.command == 'serve':
+        setup_logging()
+        server = ListopiaServer(listopia, args.host, args.port, args.latency, compress=not args.no_gzip)
+        print(f"🌐 Serving {args.pages:,} pages x {args.rows} rows at {server.list_url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.server_close()
+        return
+
+    # Per-page INFO logs would dominate the measurement
+    setup_logging(level=logging.WARNING)
+    result = soak(listopia, workers=args.workers, interrupt_after=args.interrupt_after, delay=args.delay,
+                  latency=args.latency, stream=not args.no_stream, compress=not args.no_gzip,
+                  data_dir=args.data_dir)
+    sys.exit(0 if print_soak_report(result) else 1)
+
+
+if __name__ == "__main__":
+    main()
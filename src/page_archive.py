@@ -0,0 +1,296 @@
+"""
+Compressed raw-page archive for the Goodreads scraper
+Fetched page bodies are appended to compressed segment files and indexed in a
+fixed-width offset index, so book data can be re-extracted without recrawling.
+
+Usage:
+  python page_archive.py list --archive ../data/archive
+  python page_archive.py reparse --archive ../data/archive --workers 8 --output reparsed.csv
+"""
+
+import argparse
+import gzip
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from bs4 import BeautifulSoup
+
+from goodreads_scraper import BOOK_FIELDS, BookParser, GoodreadsScraper
+from scraper_logging import setup_logging, setup_worker_logging, worker_log_queue
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency - gzip is used without it
+    zstandard = None
+
+CODEC_GZIP = 1
+CODEC_ZSTD = 2
+
+# url hash, fetch time, segment number, offset, compressed length, codec
+INDEX_RECORD = struct.Struct('<16sdIQIB3x')
+# The same layout as a numpy record, for vectorized access to the mapped index
+INDEX_DTYPE = np.dtype([('key', 'S16'), ('fetched_at', '<f8'), ('segment', '<u4'), ('offset', '<u8'),
+                        ('length', '<u4'), ('codec', 'u1'), ('padding', 'V3')])
+INDEX_FILE = 'pages.idx'
+SEGMENT_SIZE_LIMIT = 1 << 30  # Start a new segment after 1 GB
+
+
+def url_key(url: str) -> bytes:
+    """Fixed-width index key for a URL"""
+    return hashlib.blake2b(url.encode('utf-8'), digest_size=16).digest()
+
+
+def segment_name(segment: int) -> str:
+    return f'segment_{segment:05d}.seg'
+
+
+def compress_frame(payload: bytes, codec: int) -> bytes:
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=3).compress(payload)
+    return gzip.compress(payload, compresslevel=6)
+
+
+def decompress_frame(frame: bytes, codec: int) -> bytes:
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Archive uses zstd frames - install the 'zstandard' package")
+        return zstandard.ZstdDecompressor().decompress(frame)
+    return gzip.decompress(frame)
+
+
+class PageArchive:
+    """Append-only archive of raw page bodies
+
+    Each page is one independently compressed frame holding the URL and the
+    body. The index has one fixed-width record per page, so record i is at
+    offset i * INDEX_RECORD.size and the index can be memory-mapped.
+    """
+
+    def __init__(self, archive_dir, codec: Optional[str] = None):
+        self.archive_dir = Path(archive_dir)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.archive_dir / INDEX_FILE
+
+        if codec == 'zstd' and zstandard is None:
+            raise RuntimeError("zstd codec requested but the 'zstandard' package is not installed")
+        if codec == 'zstd' or (codec is None and zstandard is not None):
+            self.codec = CODEC_ZSTD
+        else:
+            self.codec = CODEC_GZIP
+
+        self._lock = threading.Lock()
+        self._segment = self._last_segment()
+
+    def _last_segment(self) -> int:
+        segments = sorted(self.archive_dir.glob('segment_*.seg'))
+        if not segments:
+            return 0
+        return int(segments[-1].stem.replace('segment_', ''))
+
+    def append(self, url: str, content: bytes, fetched_at: Optional[float] = None):
+        """Archive one page body"""
+        fetched_at = fetched_at or time.time()
+        frame = compress_frame(url.encode('utf-8') + b'\n' + content, self.codec)
+
+        with self._lock:
+            segment_path = self.archive_dir / segment_name(self._segment)
+            if segment_path.exists() and segment_path.stat().st_size + len(frame) > SEGMENT_SIZE_LIMIT:
+                self._segment += 1
+                segment_path = self.archive_dir / segment_name(self._segment)
+
+            with open(segment_path, 'ab') as f:
+                offset = f.tell()
+                f.write(frame)
+
+            # The index record is written last, so a crash leaves at most an unindexed frame
+            record = INDEX_RECORD.pack(url_key(url), fetched_at, self._segment, offset, len(frame), self.codec)
+            with open(self.index_path, 'ab') as f:
+                f.write(record)
+
+        logging.debug("Archived %s (%d -> %d bytes)", url, len(content), len(frame))
+
+
+class ArchiveReader:
+    """Read-only view of an archive with a memory-mapped index"""
+
+    def __init__(self, archive_dir):
+        self.archive_dir = Path(archive_dir)
+        self.index_path = self.archive_dir / INDEX_FILE
+        self._index_file = None
+        self._index = b''
+        self._records = np.empty(0, dtype=INDEX_DTYPE)
+        self._segments: Dict[int, mmap.mmap] = {}
+
+        # Record numbers sorted by (url key, fetch time), built on the first lookup
+        self._key_order = None
+        self._sorted_keys = None
+
+        if self.index_path.exists() and self.index_path.stat().st_size:
+            self._index_file = open(self.index_path, 'rb')
+            self._index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._records = np.frombuffer(self._index, dtype=INDEX_DTYPE,
+                                          count=len(self._index) // INDEX_RECORD.size)
+
+    def __len__(self) -> int:
+        return len(self._index) // INDEX_RECORD.size
+
+    def record(self, i: int) -> Tuple[bytes, float, int, int, int, int]:
+        """Index record i: (url key, fetch time, segment, offset, length, codec)"""
+        return INDEX_RECORD.unpack_from(self._index, i * INDEX_RECORD.size)
+
+    def _segment_map(self, segment: int) -> mmap.mmap:
+        if segment not in self._segments:
+            with open(self.archive_dir / segment_name(segment), 'rb') as f:
+                self._segments[segment] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._segments[segment]
+
+    def read(self, i: int) -> Tuple[str, float, bytes]:
+        """Return (url, fetch time, body) of record i"""
+        _, fetched_at, segment, offset, length, codec = self.record(i)
+        frame = self._segment_map(segment)[offset:offset + length]
+        url, _, content = decompress_frame(frame, codec).partition(b'\n')
+        return url.decode('utf-8'), fetched_at, content
+
+    def _build_key_order(self):
+        if self._key_order is None:
+            records = np.arange(len(self._records))
+            self._key_order = np.lexsort((records, self._records['fetched_at'], self._records['key']))
+            self._sorted_keys = self._records['key'][self._key_order]
+
+    def find(self, url: str) -> List[int]:
+        """Record numbers archived for a URL, oldest first (binary search on the sorted keys)"""
+        self._build_key_order()
+        key = np.array(url_key(url), dtype='S16')
+        start = np.searchsorted(self._sorted_keys, key, side='left')
+        stop = np.searchsorted(self._sorted_keys, key, side='right')
+        return self._key_order[start:stop].tolist()
+
+    def latest_records(self) -> List[int]:
+        """Newest record number for every archived URL, newest first"""
+        self._build_key_order()
+        if not len(self._key_order):
+            return []
+        # The last entry of each key group is the most recent fetch
+        group_end = np.append(self._sorted_keys[1:] != self._sorted_keys[:-1], True)
+        latest = self._key_order[group_end]
+        return latest[np.argsort(-self._records['fetched_at'][latest], kind='stable')].tolist()
+
+    def iter_records(self) -> Iterator[Tuple[int, float, int]]:
+        """Yield (record number, fetch time, compressed length) for every page"""
+        for i in range(len(self)):
+            _, fetched_at, _, _, length, _ = self.record(i)
+            yield i, fetched_at, length
+
+    def close(self):
+        for segment_map in self._segments.values():
+            segment_map.close()
+        self._segments.clear()
+        # Drop the numpy views before closing the map they point into
+        self._records = np.empty(0, dtype=INDEX_DTYPE)
+        self._key_order = self._sorted_keys = None
+        if self._index_file:
+            self._index.close()
+            self._index_file.close()
+            self._index_file = None
+
+
+# Per-process reader and parser for reparse workers
+_worker_reader = None
+_worker_parser = None
+
+
+def _init_reparse_worker(archive_dir: str, log_queue, log_level: int):
+    global _worker_reader, _worker_parser
+    setup_worker_logging(log_queue, log_level)
+    _worker_reader = ArchiveReader(archive_dir)
+    _worker_parser = BookParser()
+
+
+def reparse_records(records: List[int]) -> List[tuple]:
+    """Re-extract books from the given archive records in a worker process"""
+    rows = []
+    for i in records:
+        try:
+            _, _, content = _worker_reader.read(i)
+            soup = BeautifulSoup(content, 'html.parser')
+            for book in _worker_parser.parse_books(soup):
+                rows.append(tuple(book[field] for field in BOOK_FIELDS))
+        except Exception as e:
+            logging.error(f"Error reparsing archive record {i}: {e}")
+    return rows
+
+
+def reparse(archive_dir, workers: Optional[int] = None, chunk_size: int = 200) -> List[Dict]:
+    """Re-run book extraction over the archived pages in parallel
+
+    Only the newest fetch of each URL is parsed, newest pages first, so when a
+    book shows up more than once the duplicate removal keeps the latest data.
+    """
+    reader = ArchiveReader(archive_dir)
+    total = len(reader)
+    records = reader.latest_records()
+    reader.close()
+    if not records:
+        return []
+
+    workers = workers or os.cpu_count() or 1
+    chunks = [records[start:start + chunk_size] for start in range(0, len(records), chunk_size)]
+    logging.info(f"Reparsing {len(records)} archived pages ({total - len(records)} older fetches skipped) "
+                 f"with {workers} workers")
+
+    books = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_reparse_worker,
+                             initargs=(str(archive_dir), worker_log_queue(), logging.getLogger().level)) as executor:
+        for rows in executor.map(reparse_records, chunks):
+            books.extend(dict(zip(BOOK_FIELDS, row)) for row in rows)
+
+    logging.info(f"Reparse completed: {len(books)} books")
+    return books
+
+
+def parse_arguments():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Raw page archive tools')
+    parser.add_argument('command', choices=['list', 'reparse'], help='Command to run')
+    parser.add_argument('--archive', type=str, default='../data/archive', help='Archive directory (default: ../data/archive)')
+    parser.add_argument('--workers', type=int, help='Number of parser processes (default: CPU count)')
+    parser.add_argument('--output', type=str, default='goodreads_books_reparsed.csv',
+                        help='Output CSV file name for reparse (default: goodreads_books_reparsed.csv)')
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    args = parse_arguments()
+    setup_logging()
+
+    if args.command == 'list':
+        reader = ArchiveReader(args.archive)
+        total_bytes = 0
+        for i, fetched_at, length in reader.iter_records():
+            url, _, content = reader.read(i)
+            total_bytes += length
+            timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(fetched_at))
+            print(f"{i}. {timestamp} {url} ({len(content) / 1024:.1f} KB -> {length / 1024:.1f} KB)")
+        print(f"\n📦 {len(reader)} pages, {total_bytes / 1024 / 1024:.1f} MB compressed")
+        reader.close()
+        return
+
+    books = reparse(args.archive, workers=args.workers)
+    if books:
+        GoodreadsScraper().save_to_csv(books, args.output)
+    else:
+        print("❌ No archived pages found.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Parallel analysis of many scraped datasets
+Each CSV is summarized in its own process into mergeable aggregates (exact
+sums/counts, HyperLogLog, KLL, top-k books, Misra-Gries authors); the
+summaries are merged without ever concatenating the data.
+
+Usage:
+  python parallel_analysis.py ../data/*.csv --workers 8
+  python parallel_analysis.py ../data/*.csv --exact   # also compare with the exact path
+"""
+
+import argparse
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from typing import Dict, List
+
+import pandas as pd
+
+from analyze_data import compute_author_stats
+from sketches import HyperLogLog, KLLSketch, MisraGries
+
+COLUMNS = ['title', 'author', 'average_rating', 'ratings_count']
+QUANTILES = [0.1, 0.25, 0.5, 0.75, 0.9]
+TOP_N = 10
+
+
+def top_unique_books(df: pd.DataFrame, n: int) -> pd.DataFrame:
+    """Most rated books, one row per title/author (the highest rating count wins)"""
+    ranked = df.sort_values('ratings_count', ascending=False, kind='stable')
+    return ranked.drop_duplicates(subset=['title', 'author']).head(n)
+
+
+class DatasetSummary:
+    """Mergeable summary of one or more datasets"""
+
+    def __init__(self, top_k: int = 50, author_capacity: int = 1000):
+        self.top_k = top_k
+        self.files = 0
+        self.rows = 0
+        self.rating_count = 0
+        self.rating_sum = 0.0
+        self.rating_min = math.inf
+        self.rating_max = -math.inf
+        self.authors = HyperLogLog()
+        self.ratings = KLLSketch()
+        self.top_books = pd.DataFrame(columns=COLUMNS)
+        self.top_authors = MisraGries(author_capacity)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, **kwargs) -> 'DatasetSummary':
+        summary = cls(**kwargs)
+        ratings = pd.to_numeric(df['average_rating'], errors='coerce').dropna()
+
+        summary.files = 1
+        summary.rows = len(df)
+        summary.rating_count = len(ratings)
+        summary.rating_sum = float(ratings.sum())
+        if len(ratings):
+            summary.rating_min = float(ratings.min())
+            summary.rating_max = float(ratings.max())
+        summary.authors.update(df['author'])
+        summary.ratings.update(ratings.to_numpy())
+        summary.top_books = top_unique_books(df[COLUMNS], summary.top_k)
+        summary.top_authors.update(df.groupby('author')['ratings_count'].sum().to_dict())
+        return summary
+
+    def merge(self, other: 'DatasetSummary') -> 'DatasetSummary':
+        self.files += other.files
+        self.rows += other.rows
+        self.rating_count += other.rating_count
+        self.rating_sum += other.rating_sum
+        self.rating_min = min(self.rating_min, other.rating_min)
+        self.rating_max = max(self.rating_max, other.rating_max)
+        self.authors.merge(other.authors)
+        self.ratings.merge(other.ratings)
+        # A book can be on several lists - keep one copy
+        self.top_books = top_unique_books(pd.concat([self.top_books, other.top_books]), self.top_k)
+        self.top_authors.merge(other.top_authors)
+        return self
+
+    def statistics(self) -> Dict[str, float]:
+        stats = {
+            'Total books': self.rows,
+            'Unique authors': self.authors.count(),
+            'Average rating': self.rating_sum / self.rating_count if self.rating_count else float('nan'),
+            'Highest rating': self.rating_max,
+            'Lowest rating': self.rating_min,
+        }
+        for q in QUANTILES:
+            stats[f"Rating p{int(q * 100)}"] = self.ratings.quantile(q)
+        return stats
+
+
+def summarize_file(path: str) -> DatasetSummary:
+    """Summarize one CSV (runs in a worker process)"""
+    df = pd.read_csv(path, usecols=COLUMNS)
+    return DatasetSummary.from_frame(df)
+
+
+def summarize_files(paths: List[str], workers: int = None) -> DatasetSummary:
+    """Summarize every file in its own process and merge the results"""
+    workers = workers or min(len(paths), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        summaries = list(executor.map(summarize_file, paths))
+    return reduce(lambda merged, summary: merged.merge(summary), summaries)
+
+
+def exact_statistics(paths: List[str]) -> Dict:
+    """Same statistics computed exactly on the concatenated data"""
+    df = pd.concat([pd.read_csv(path, usecols=COLUMNS) for path in paths], ignore_index=True)
+    ratings = pd.to_numeric(df['average_rating'], errors='coerce').dropna()
+    stats = {
+        'Total books': len(df),
+        'Unique authors': df['author'].nunique(),
+        'Average rating': ratings.mean(),
+        'Highest rating': ratings.max(),
+        'Lowest rating': ratings.min(),
+    }
+    for q in QUANTILES:
+        stats[f"Rating p{int(q * 100)}"] = ratings.quantile(q, interpolation='lower')
+    return {
+        'stats': stats,
+        'ratings': ratings,
+        'top_books': top_unique_books(df, TOP_N),
+        'author_stats': compute_author_stats(df),
+    }
+
+
+def print_report(summary: DatasetSummary, exact: Dict = None):
+    """Print merged statistics (with errors against the exact path when given)"""
+    print(f"=== BASIC STATISTICS ({summary.files} files, merged summaries) ===")
+    stats = summary.statistics()
+    for metric, value in stats.items():
+        line = f"{metric:<16} {value:>14,.2f}"
+        if metric == 'Unique authors':
+            line += f"   (± {summary.authors.relative_error:.2%} std. error)"
+        elif metric.startswith('Rating p'):
+            line += f"   (± {summary.ratings.rank_error:.2%} rank error)"
+        if exact:
+            exact_value = exact['stats'][metric]
+            line += f"   exact {exact_value:,.2f}"
+            if metric.startswith('Rating p'):
+                # Tied ratings: any rank between P(X < v) and P(X <= v) is exact
+                q = float(metric[len('Rating p'):]) / 100
+                lower = (exact['ratings'] < value).mean()
+                upper = (exact['ratings'] <= value).mean()
+                line += f" (rank error {max(0.0, lower - q, q - upper):.2%})"
+            elif exact_value:
+                line += f" (error {abs(value - exact_value) / abs(exact_value):.2%})"
+        print(line)
+    print()
+
+    print(f"=== TOP {TOP_N} MOST POPULAR BOOKS (By Rating Count) ===")
+    print(summary.top_books.head(TOP_N).to_string(index=False))
+    if exact:
+        # Compare rating counts, books with equal counts may come in any order
+        same = summary.top_books.head(TOP_N)['ratings_count'].tolist() == exact['top_books']['ratings_count'].tolist()
+        print(f"(exact path: {'identical' if same else 'DIFFERENT'})")
+    print()
+
+    print(f"=== TOP {TOP_N} AUTHORS (By Total Rating Count) ===")
+    print(f"Estimates undercount by at most {summary.top_authors.error:,.0f} ratings")
+    for author, estimate in summary.top_authors.top(TOP_N):
+        line = f"{author:<40} {estimate:>16,.0f}"
+        if exact:
+            line += f"   exact {exact['author_stats']['Total_Rating_Count'].get(author, 0):>16,.0f}"
+        print(line)
+    print()
+
+
+def parse_arguments():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Analyze many scraped CSV files in parallel')
+    parser.add_argument('files', nargs='+', help='Scraper output CSV files')
+    parser.add_argument('--workers', type=int, help='Number of processes (default: CPU count)')
+    parser.add_argument('--exact', action='store_true',
+                        help='Also run the exact (concatenating) path and report the errors')
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    args = parse_arguments()
+    summary = summarize_files(args.files, args.workers)
+    exact = exact_statistics(args.files) if args.exact else None
+    print_report(summary, exact)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Process-pool HTML parsing for the Goodreads scraper
+Fetching runs on a background thread, parsing runs in worker processes
+"""
+
+import os
+import queue
+import threading
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from goodreads_scraper import BOOK_FIELDS, BookParser, GoodreadsScraper
+from scraper_logging import setup_worker_logging, worker_log_queue
+
+# Marks the end of the fetched page stream
+_END_OF_PAGES = None
+
+# Parser instance owned by each worker process
+_worker_parser = None
+
+
+def _init_worker(log_queue, log_level: int):
+    """Create the per-process parser used for extraction"""
+    global _worker_parser
+    # Log through the parent's listener (one writer for scraper.log)
+    setup_worker_logging(log_queue, log_level)
+    _worker_parser = BookParser()
+
+
+def parse_page_batch(page_num: int, content: bytes) -> Tuple[int, List[tuple]]:
+    """Parse one raw page in a worker process
+
+    Returns the page number and the book rows as compact tuples (BOOK_FIELDS order).
+    """
+    soup = BeautifulSoup(content, 'html.parser')
+    books = _worker_parser.parse_books(soup)
+    return page_num, [tuple(book[field] for field in BOOK_FIELDS) for book in books]
+
+
+def rows_to_books(rows: List[tuple]) -> List[Dict]:
+    """Convert compact row tuples back to book dictionaries"""
+    return [dict(zip(BOOK_FIELDS, row)) for row in rows]
+
+
+class ParsePipeline:
+    """Fetch pages on a thread and parse them in a process pool
+
+    Raw response bytes go through a bounded queue and at most `max_pending`
+    pages are parsed at once, so memory stays bounded when parsing is slower
+    than fetching (or the other way around).
+    """
+
+    def __init__(self, scraper: GoodreadsScraper, workers: Optional[int] = None,
+                 queue_size: Optional[int] = None):
+        self.scraper = scraper
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size or self.workers * 2
+        self.max_pending = self.workers * 2
+
+    def _fetch_pages(self, list_url: str, pages: List[int], delay: float, first_page: Optional[bytes],
+                     page_queue: queue.Queue, stop_event: threading.Event):
+        """Fetch the planned pages and push raw bodies onto the queue"""
+        try:
+            for i, page_num in enumerate(pages):
+                if stop_event.is_set():
+                    break
+
+                if page_num == 1 and first_page is not None:
+                    # Already fetched while planning the crawl
+                    self._put(page_queue, (page_num, first_page), stop_event)
+                    continue
+
+                url = self.scraper._get_page_url(list_url, page_num)
+                content = None
+                try:
+                    logging.info(f"Fetching page: {url}")
+                    content = self.scraper.fetch_page(url)
+                except Exception as e:
+                    logging.error(f"Error fetching page ({url}): {e}")
+
+                self._put(page_queue, (page_num, content), stop_event)
+
+                if i < len(pages) - 1:
+                    time.sleep(delay)  # Wait for rate limiting
+        finally:
+            self._put(page_queue, _END_OF_PAGES, stop_event)
+
+    def _put(self, page_queue: queue.Queue, item, stop_event: threading.Event):
+        """Blocking put that gives up once the pipeline is stopped"""
+        while not stop_event.is_set():
+            try:
+                page_queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def run(self, list_url: str, pages: List[int], delay: float = 1.0,
+            first_page: Optional[bytes] = None) -> Iterator[Tuple[int, List[Dict]]]:
+        """Yield (page_num, books) for the planned pages as they finish (books is None if the page failed)"""
+        page_queue = queue.Queue(maxsize=self.queue_size)
+        stop_event = threading.Event()
+        fetcher = threading.Thread(
+            target=self._fetch_pages,
+            args=(list_url, pages, delay, first_page, page_queue, stop_event),
+            daemon=True
+        )
+
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                       initargs=(worker_log_queue(), logging.getLogger().level))
+        pending = {}
+        fetching = True
+
+        fetcher.start()
+        try:
+            while fetching or pending:
+                # Only take new pages while the pool has room (backpressure)
+                while fetching and len(pending) < self.max_pending:
+                    try:
+                        item = page_queue.get(timeout=0.1 if pending else None)
+                    except queue.Empty:
+                        break
+
+                    if item is _END_OF_PAGES:
+                        fetching = False
+                        break
+
+                    page_num, content = item
+                    if content is None:
+                        # Fetch failed - report the page as failed (None), not as empty
+                        yield page_num, None
+                    else:
+                        future = executor.submit(parse_page_batch, page_num, content)
+                        pending[future] = page_num
+
+                if pending:
+                    done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        page_num = pending.pop(future)
+                        try:
+                            _, rows = future.result()
+                        except Exception as e:
+                            logging.error(f"Error parsing page {page_num}: {e}")
+                            yield page_num, None
+                            continue
+                        logging.info(f"Found {len(rows)} books on page {page_num}")
+                        yield page_num, rows_to_books(rows)
+        finally:
+            stop_event.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            fetcher.join(timeout=5)
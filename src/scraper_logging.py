@@ -0,0 +1,162 @@
+"""
+Logging setup for the Goodreads scraper
+Log records are handed to a queue and written by a background listener thread;
+worker processes forward their records to the parent's listener
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+from typing import Optional
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Records waiting for the listener thread; when full, logging blocks until it catches up
+LOG_QUEUE_SIZE = 10000
+
+# Active listener, its root handler and the process that started it
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+_configured_pid: Optional[int] = None
+
+# Queue and listener receiving records from worker processes (see worker_log_queue)
+_worker_queue = None
+_worker_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread
+
+    The queue is bounded: a thread that logs faster than the handlers can
+    write waits for the listener instead of growing the backlog (and memory)
+    without limit, so sustained DEBUG output runs at the handlers' pace.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue stays in-process, so the record does not need to be pickled
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        self.queue.put(record)
+
+
+class BoundedQueueListener(logging.handlers.QueueListener):
+    """QueueListener whose stop waits for room in a full bounded queue"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format each record as a single JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def setup_logging(level: Optional[int] = None, log_file: Optional[str] = 'scraper.log',
+                  json_lines: bool = False, force: bool = False):
+    """Configure root logging once per process
+
+    The scraping thread only enqueues records; formatting and file/console
+    I/O happen on the QueueListener thread. Repeated calls only update the
+    level unless `force` is set (or the call happens in a forked child process).
+    """
+    global _listener, _queue_handler, _configured_pid
+
+    if _configured_pid == os.getpid() and not force:
+        if level is not None:
+            logging.getLogger().setLevel(level)
+        return
+
+    stop_logging()
+
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+
+    for handler in handlers:
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    if json_lines and log_file:
+        handlers[-1].setFormatter(JsonLinesFormatter())
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    _queue_handler = DeferredQueueHandler(log_queue)
+    root.addHandler(_queue_handler)
+    root.setLevel(logging.INFO if level is None else level)
+
+    _listener = BoundedQueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    _configured_pid = os.getpid()
+
+
+def worker_log_queue():
+    """Queue for worker process records, written by this process's handlers
+
+    Pass it to the workers (e.g. through a pool initializer) and call
+    setup_worker_logging with it there.
+    """
+    global _worker_queue, _worker_listener
+
+    setup_logging()
+    if _worker_listener is None and _listener is not None:
+        _worker_queue = multiprocessing.Queue()
+        _worker_listener = logging.handlers.QueueListener(_worker_queue, *_listener.handlers,
+                                                          respect_handler_level=True)
+        _worker_listener.start()
+    return _worker_queue
+
+
+def setup_worker_logging(log_queue, level: Optional[int] = None):
+    """Send this (worker) process's records to the parent's listener
+
+    Records are formatted here and put on the multiprocessing queue right away,
+    so nothing is left behind in a worker thread when the process exits.
+    Later setup_logging calls in this process only update the level.
+    """
+    global _listener, _queue_handler, _configured_pid
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    _listener = None
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    root.addHandler(_queue_handler)
+    root.setLevel(logging.INFO if level is None else level)
+    _configured_pid = os.getpid()
+
+
+def stop_logging():
+    """Flush pending records and stop the listener threads"""
+    global _listener, _queue_handler, _configured_pid, _worker_queue, _worker_listener
+
+    if _listener is not None and _configured_pid == os.getpid():
+        logging.getLogger().removeHandler(_queue_handler)
+        if _worker_listener is not None:
+            _worker_listener.stop()
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+    _listener = None
+    _queue_handler = None
+    _configured_pid = None
+    _worker_queue = None
+    _worker_listener = None
+
+
+atexit.register(stop_logging)
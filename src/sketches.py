@@ -0,0 +1,154 @@
+"""
+Mergeable approximate aggregates
+HyperLogLog (distinct counts), KLL (quantiles) and Misra-Gries (weighted
+heavy hitters). Every sketch can be built per dataset and merged later.
+"""
+
+import math
+import random
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def hash_values(values: pd.Series) -> np.ndarray:
+    """Deterministic 64-bit hashes (identical across processes and runs)"""
+    return pd.util.hash_pandas_object(values.astype(str), index=False).to_numpy(dtype=np.uint64)
+
+
+class HyperLogLog:
+    """Distinct count estimate with standard error 1.04 / sqrt(2 ** precision)"""
+
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def update(self, values: pd.Series):
+        hashes = hash_values(values.dropna())
+        if not len(hashes):
+            return
+        rest_bits = 64 - self.precision
+        index = (hashes >> np.uint64(rest_bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << rest_bits) - 1)
+        # Position of the leftmost 1-bit in the remaining bits (frexp gives the exact bit length)
+        _, bit_length = np.frexp(rest.astype(np.float64))
+        rank = (rest_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: 'HyperLogLog'):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Small range correction (linear counting)
+            estimate = m * math.log(m / zeros)
+        return float(estimate)
+
+
+class KLLSketch:
+    """Quantile sketch (Karnin-Lang-Liberty); rank error is roughly 1.65 / k"""
+
+    def __init__(self, k: int = 200, c: float = 2 / 3, seed: int = 0):
+        self.k = k
+        self.c = c
+        self.compactors: List[List[float]] = []
+        self.size = 0
+        self.max_size = 0
+        self._random = random.Random(seed)
+        self._grow()
+
+    @property
+    def rank_error(self) -> float:
+        return 1.65 / self.k
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return int(math.ceil(self.c ** depth * self.k)) + 1
+
+    def _grow(self):
+        self.compactors.append([])
+        self.max_size = sum(self._capacity(level) for level in range(len(self.compactors)))
+
+    def _compress(self):
+        for level, compactor in enumerate(self.compactors):
+            if len(compactor) >= self._capacity(level):
+                if level + 1 >= len(self.compactors):
+                    self._grow()
+                compactor.sort()
+                # Keep every other item (random offset); survivors count double one level up
+                offset = self._random.randint(0, 1)
+                self.compactors[level + 1].extend(compactor[offset::2])
+                self.compactors[level] = []
+                break
+        self.size = sum(len(compactor) for compactor in self.compactors)
+
+    def update(self, values: Iterable[float]):
+        values = [float(v) for v in values if v is not None and not math.isnan(v)]
+        self.compactors[0].extend(values)
+        self.size += len(values)
+        while self.size >= self.max_size:
+            self._compress()
+
+    def merge(self, other: 'KLLSketch'):
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for level, compactor in enumerate(other.compactors):
+            self.compactors[level].extend(compactor)
+        self.size = sum(len(compactor) for compactor in self.compactors)
+        while self.size >= self.max_size:
+            self._compress()
+
+    def quantile(self, q: float) -> float:
+        weighted: List[Tuple[float, int]] = sorted(
+            (item, 1 << level) for level, compactor in enumerate(self.compactors) for item in compactor
+        )
+        if not weighted:
+            return float('nan')
+        total = sum(weight for _, weight in weighted)
+        target = q * total
+        cumulative = 0
+        for item, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return item
+        return weighted[-1][0]
+
+
+class MisraGries:
+    """Weighted heavy hitters; each estimate undercounts by at most `error`"""
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.counters: Dict[str, float] = {}
+        self.error = 0.0
+
+    def update(self, weights: Dict[str, float]):
+        for key, weight in weights.items():
+            self.counters[key] = self.counters.get(key, 0.0) + weight
+        self._truncate()
+
+    def merge(self, other: 'MisraGries'):
+        self.error += other.error
+        self.update(other.counters)
+
+    def _truncate(self):
+        if len(self.counters) <= self.capacity:
+            return
+        # Subtract the (capacity + 1)-th largest counter from all and drop the non-positive ones
+        threshold = sorted(self.counters.values(), reverse=True)[self.capacity]
+        self.counters = {key: value - threshold for key, value in self.counters.items() if value > threshold}
+        self.error += threshold
+
+    def top(self, n: int) -> List[Tuple[str, float]]:
+        return sorted(self.counters.items(), key=lambda item: item[1], reverse=True)[:n]